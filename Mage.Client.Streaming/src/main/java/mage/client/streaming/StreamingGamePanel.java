@@ -20,6 +20,7 @@ import mage.client.game.PlayerPanelExt;
 import mage.client.components.HoverButton;
 import mage.client.plugins.adapters.MageActionCallback;
 import mage.client.plugins.impl.Plugins;
+import mage.client.util.AiHarnessConfig;
 import mage.client.util.CardsViewUtil;
 import mage.client.util.GUISizeHelper;
 import mage.client.util.ImageHelper;
@@ -1164,7 +1165,7 @@ public class StreamingGamePanel extends GamePanel {
         gameDirPath = Paths.get(gameDirStr);
 
         // Parse players config to find chatterbox player names
-        String configJson = System.getenv("XMAGE_AI_HARNESS_PLAYERS_CONFIG");
+        String configJson = AiHarnessConfig.getPlayersConfigJson();
         if (configJson != null && !configJson.isEmpty()) {
             parseChatterboxPlayers(configJson);
         }
@@ -7,6 +7,10 @@ import org.apache.log4j.Logger;
 
 import java.io.File;
 import java.io.FileReader;
+import java.io.IOException;
+import java.nio.charset.StandardCharsets;
+import java.nio.file.Files;
+import java.nio.file.Paths;
 import java.util.ArrayList;
 import java.util.List;
 
@@ -120,13 +124,31 @@ public class AiHarnessConfig {
     }
 
     private static final String PLAYERS_CONFIG_ENV = "XMAGE_AI_HARNESS_PLAYERS_CONFIG";
+    private static final String PLAYERS_CONFIG_FILE_ENV = "XMAGE_AI_HARNESS_PLAYERS_CONFIG_FILE";
+
+    /**
+     * Players config JSON passed by puppeteer, either as a file path or inline.
+     *
+     * @return the JSON, or null if puppeteer passed neither
+     */
+    public static String getPlayersConfigJson() {
+        String configFile = System.getenv(PLAYERS_CONFIG_FILE_ENV);
+        if (configFile != null && !configFile.isEmpty()) {
+            try {
+                return new String(Files.readAllBytes(Paths.get(configFile)), StandardCharsets.UTF_8);
+            } catch (IOException e) {
+                LOGGER.warn("Failed to read AI harness config from " + configFile, e);
+            }
+        }
+        return System.getenv(PLAYERS_CONFIG_ENV);
+    }
 
     /**
      * Load config from environment variable, file, or return a default config with 4 bots.
      */
     public static AiHarnessConfig load() {
-        // First, try to load from environment variable (passed by puppeteer)
-        String configJson = System.getenv(PLAYERS_CONFIG_ENV);
+        // First, try the config passed by puppeteer (file or environment variable)
+        String configJson = getPlayersConfigJson();
         if (configJson != null && !configJson.isEmpty()) {
             try {
                 Gson gson = new Gson();
@@ -136,12 +158,12 @@ public class AiHarnessConfig {
                     for (PlayerConfig p : config.players) {
                         LOGGER.info("  Player: " + p.name + ", type=" + p.type + ", isBot=" + p.isBot() + ", isHeadless=" + p.isHeadless());
                     }
-                    LOGGER.info("Loaded AI harness config from environment variable with " +
+                    LOGGER.info("Loaded AI harness config from puppeteer with " +
                             config.getBotCount() + " CPU players and " + config.getSkeletonCount() + " headless players");
                     return config;
                 }
             } catch (Exception e) {
-                LOGGER.warn("Failed to parse AI harness config from environment variable", e);
+                LOGGER.warn("Failed to parse AI harness config from puppeteer", e);
             }
         }
 
@@ -5,25 +5,87 @@ import asyncio
 import json
 import os
 import sys
+import time
+from dataclasses import dataclass
 from pathlib import Path
 
+import httpx
 from mcp import ClientSession, StdioServerParameters
 from mcp.client.stdio import stdio_client
-from openai import AsyncOpenAI
+from openai import APIConnectionError, AsyncOpenAI, DefaultAsyncHttpxClient
 
+from puppeteer.java_launch import headless_command
 from puppeteer.llm_cost import (
     DEFAULT_BASE_URL,
+    CostFileWriter,
+    exit_on_sigterm,
     get_model_price,
     load_prices,
     required_api_key_env,
-    write_cost_file,
 )
+from puppeteer.pass_only import run_pass_only
+from puppeteer.pipes import install_large_pipes
+
+try:
+    import uvloop  # libuv-backed event loop; not available on Windows
+except ImportError:
+    uvloop = None
 
 
 DEFAULT_MODEL = "google/gemini-2.0-flash-001"
 MAX_TOKENS = 256
 LLM_REQUEST_TIMEOUT_SECS = 45
 MAX_CONSECUTIVE_TIMEOUTS = 3
+# Provider errors worth retrying with the conversation intact (rate limits,
+# gateway hiccups).  Other errors reset the conversation context.
+TRANSIENT_STATUS_CODES = {429, 500, 502, 503, 504}
+# Turns are often further apart than httpx's default 5s keep-alive (the
+# auto-pass long-poll alone can take 10s), which would mean a fresh TLS
+# handshake per completion.  Hold idle connections open much longer.
+HTTP_KEEPALIVE_EXPIRY_SECS = 120
+HTTP_MAX_KEEPALIVE_CONNECTIONS = 20
+# Tools whose results the loop inspects (for logging); other results are
+# forwarded to the LLM verbatim without being decoded.
+INSPECTED_RESULT_TOOLS = {"send_chat_message", "auto_pass_until_event"}
+# Tools started while the completion is still streaming.  Chat waits for the
+# full response, so a stream that fails or times out partway never posts a
+# half-formed message.  auto_pass_until_event does take game actions, though:
+# it may already have passed priority by the time a stream is abandoned.
+EARLY_DISPATCH_TOOLS = {
+    "auto_pass_until_event",
+    "get_game_state",
+    "get_game_log",
+    "get_oracle_text",
+    "get_action_choices",
+    "is_action_on_me",
+}
+# Tools whose relative order is visible to other players.  A turn with more
+# than one of these executes its tool calls sequentially instead of at once.
+ORDERED_TOOLS = {"send_chat_message"}
+# Rolling history budget (excluding the system prompt), estimated at
+# CHARS_PER_TOKEN characters per token.  Trimming cuts back to half of it.
+HISTORY_TOKEN_BUDGET = 6000
+CHARS_PER_TOKEN = 4
+# auto_pass_until_event results are reduced to their counters once this
+# many newer ones exist; the LLM has already reacted to their new_log.
+FULL_PASS_RESULTS_KEPT = 2
+EARLIER_EVENT_MAX_CHARS = 300
+# When a turn ends on an auto_pass_until_event that saw no event (and no
+# chat went out), there is nothing for the LLM to react to, so keep passing
+# locally.  After this many such passes the LLM gets a turn regardless.
+MAX_SILENT_PASSES = 4
+
+# A repeated get_game_state is answered from memory while every
+# auto_pass_until_event since the last real one reported no actions and no
+# new log, up to this age.  Quiet pass results are tiny; anything longer
+# carries log text and invalidates the cache without being decoded.
+GAME_STATE_CACHE_MAX_AGE_SECS = 30
+QUIET_PASS_RESULT_MAX_CHARS = 200
+
+PERSONALITY_REMINDER = (
+    "Remember: you're an entertaining chatterbox. React to plays with short, "
+    "funny chat messages. Don't just silently observe."
+)
 
 
 DEFAULT_SYSTEM_PROMPT = """\
@@ -68,6 +130,234 @@ async def execute_tool(session: ClientSession, name: str, arguments: dict) -> st
         return json.dumps({"error": str(e)})
 
 
+class GameStateCachingSession:
+    """ClientSession wrapper that skips get_game_state calls when nothing changed."""
+
+    def __init__(self, session: ClientSession):
+        self._session = session
+        self._state_result = None
+        self._state_time = 0.0
+
+    def _still_quiet(self, name: str, result) -> bool:
+        """Whether the game state is unchanged after this (non-state) tool call."""
+        if name != "auto_pass_until_event":
+            return name in {"get_oracle_text", "get_game_log", "send_chat_message"}
+        text = result.content[0].text if result.content else ""
+        if len(text) > QUIET_PASS_RESULT_MAX_CHARS:
+            return False
+        data = parse_tool_result(text)
+        return "error" not in data and not data.get("actions_taken") and not data.get("new_chars")
+
+    async def call_tool(self, name: str, arguments: dict | None = None):
+        if name == "get_game_state" and self._state_result is not None:
+            if time.monotonic() - self._state_time < GAME_STATE_CACHE_MAX_AGE_SECS:
+                return self._state_result
+        try:
+            result = await self._session.call_tool(name, arguments)
+        except Exception:
+            self._state_result = None
+            raise
+        if name == "get_game_state":
+            if not result.isError:
+                self._state_result = result
+                self._state_time = time.monotonic()
+        elif not self._still_quiet(name, result):
+            self._state_result = None
+        return result
+
+
+async def warm_up_connection(http_client: httpx.AsyncClient, base_url: str) -> None:
+    """Open a pooled connection to the LLM API; any response will do."""
+    try:
+        await http_client.head(base_url, timeout=10)
+    except Exception as e:
+        print(f"[chatterbox] Connection warm-up failed: {e}")
+
+
+def parse_tool_result(result_text: str) -> dict:
+    """Decode a JSON-object tool result; anything else decodes to {}."""
+    if not result_text.startswith("{"):
+        return {}
+    try:
+        return json.loads(result_text)
+    except json.JSONDecodeError:
+        return {}
+
+
+def estimate_tokens(message: dict) -> int:
+    """Rough token count of a history message."""
+    chars = len(message.get("content") or "")
+    chars += sum(len(tc["function"]["arguments"] or "") for tc in message.get("tool_calls") or ())
+    return chars // CHARS_PER_TOKEN + 1
+
+
+def compact_pass_result(message: dict, result_data: dict) -> None:
+    """Replace an old auto_pass_until_event result with just its counters."""
+    message["content"] = json.dumps({
+        "actions_taken": result_data.get("actions_taken", 0),
+        "event_occurred": result_data.get("event_occurred", False),
+    })
+
+
+def record_pass_result(
+    full_pass_results: list[tuple[dict, dict]],
+    tool_msg: dict,
+    result_data: dict,
+    earlier_event: str,
+) -> str:
+    """Track a new auto-pass result, compacting ones that fell out of the window.
+
+    Returns the most recent event log text among compacted results (or
+    ``earlier_event`` unchanged), for the reminder used after trimming.
+    """
+    full_pass_results.append((tool_msg, result_data))
+    while len(full_pass_results) > FULL_PASS_RESULTS_KEPT:
+        old_msg, old_data = full_pass_results.pop(0)
+        compact_pass_result(old_msg, old_data)
+        if old_data.get("event_occurred") and old_data.get("new_log"):
+            earlier_event = old_data["new_log"][-EARLIER_EVENT_MAX_CHARS:]
+    return earlier_event
+
+
+def is_tool_result(message: dict) -> bool:
+    """True for a role=tool history message."""
+    return message.get("role") == "tool"
+
+
+def trim_history(messages: list[dict], system_msg: dict, earlier_event: str) -> list:
+    """Keep the newest messages that fit in half the budget, behind a reminder.
+
+    The cut never lands between an assistant tool_calls message and its tool
+    results, since providers reject orphaned tool_call_ids.
+    """
+    target = HISTORY_TOKEN_BUDGET // 2
+    kept: list[dict] = []
+    tokens = 0
+    for message in reversed(messages[1:]):
+        if tokens >= target and not is_tool_result(kept[-1]):
+            break
+        kept.append(message)
+        tokens += estimate_tokens(message)
+    kept.reverse()
+
+    reminder = PERSONALITY_REMINDER
+    if earlier_event:
+        reminder += f" Earlier in the game: {earlier_event}"
+    return [system_msg, {"role": "user", "content": reminder}, *kept]
+
+
+def system_message(model: str, system_prompt: str) -> dict:
+    """Build the system message, marked cacheable where the provider needs a hint.
+
+    OpenAI and Gemini cache identical prompt prefixes automatically; Anthropic
+    models only cache blocks tagged with cache_control.  Either way the same
+    dict must stay at messages[0] for every request so the prefix is reused.
+    """
+    if model.startswith("anthropic/"):
+        return {
+            "role": "system",
+            "content": [
+                {"type": "text", "text": system_prompt, "cache_control": {"type": "ephemeral"}},
+            ],
+        }
+    return {"role": "system", "content": system_prompt}
+
+
+class RequestPacer:
+    """Spaces LLM requests evenly to stay under a requests-per-minute cap."""
+
+    def __init__(self, rpm: int | None):
+        self._interval = 60 / rpm if rpm else 0.0
+        self._next_slot = 0.0
+
+    async def wait(self) -> None:
+        """Sleep until the next request is allowed (no-op without a cap)."""
+        if not self._interval:
+            return
+        now = time.monotonic()
+        delay = self._next_slot - now
+        self._next_slot = max(now, self._next_slot) + self._interval
+        if delay > 0:
+            await asyncio.sleep(delay)
+
+
+@dataclass
+class StreamedToolCall:
+    """A tool call assembled from streamed deltas, possibly already executing."""
+    id: str = ""
+    name: str = ""
+    arguments: str = ""
+    args: dict | None = None
+    task: asyncio.Task | None = None
+
+    def start(self, session: ClientSession) -> None:
+        """Begin executing an early-dispatch call once its arguments are complete JSON."""
+        if self.task is not None or self.name not in EARLY_DISPATCH_TOOLS:
+            return
+        try:
+            self.args = json.loads(self.arguments) if self.arguments else None
+        except json.JSONDecodeError:
+            return  # arguments still streaming
+        if self.args is not None:
+            self.task = asyncio.create_task(execute_tool(session, self.name, self.args))
+
+    async def result(self, session: ClientSession) -> str:
+        """Wait for (or start, if never dispatched) the call and return its result text."""
+        if self.task is None:
+            self.args = json.loads(self.arguments) if self.arguments else {}
+            self.task = asyncio.create_task(execute_tool(session, self.name, self.args))
+        return await self.task
+
+    def as_message_entry(self) -> dict:
+        """Serialize for the assistant message's tool_calls list."""
+        return {
+            "id": self.id,
+            "type": "function",
+            "function": {"name": self.name, "arguments": self.arguments},
+        }
+
+
+async def stream_completion(client: AsyncOpenAI, session: ClientSession, **kwargs):
+    """Stream a chat completion, starting each tool call as soon as it is complete.
+
+    Returns (content, tool_calls, usage).  EARLY_DISPATCH_TOOLS calls whose
+    arguments finish parsing mid-stream are already running when this returns,
+    overlapping the MCP round-trip with the rest of the decode.
+    """
+    content_parts: list[str] = []
+    calls: dict[int, StreamedToolCall] = {}
+    usage = None
+    try:
+        stream = await client.chat.completions.create(
+            stream=True,
+            stream_options={"include_usage": True},
+            **kwargs,
+        )
+        async for chunk in stream:
+            if chunk.usage:
+                usage = chunk.usage
+            if not chunk.choices:
+                continue
+            delta = chunk.choices[0].delta
+            if delta.content:
+                content_parts.append(delta.content)
+            for tc_delta in delta.tool_calls or ():
+                call = calls.setdefault(tc_delta.index, StreamedToolCall())
+                if tc_delta.id:
+                    call.id = tc_delta.id
+                if tc_delta.function:
+                    call.name += tc_delta.function.name or ""
+                    call.arguments += tc_delta.function.arguments or ""
+                call.start(session)
+    except BaseException:
+        # Timed out or failed mid-stream: don't leave orphaned tool calls running
+        for call in calls.values():
+            if call.task is not None:
+                call.task.cancel()
+        raise
+    return "".join(content_parts), [calls[i] for i in sorted(calls)], usage
+
+
 async def run_llm_loop(
     session: ClientSession,
     client: AsyncOpenAI,
@@ -77,152 +367,211 @@ async def run_llm_loop(
     username: str = "",
     game_dir: Path | None = None,
     prices: dict[str, tuple[float, float]] | None = None,
+    verbose: bool = False,
+    max_rpm: int | None = None,
 ) -> None:
     """Run the LLM-driven agentic loop."""
+    session = GameStateCachingSession(session)
+    system_msg = system_message(model, system_prompt)
     messages = [
-        {"role": "system", "content": system_prompt},
+        system_msg,
         {"role": "user", "content": "The game is starting. Begin your loop: call auto_pass_until_event to wait for interesting game events."},
     ]
     calls_since_chat = 0
     model_price = get_model_price(model, prices or {})
     cumulative_cost = 0.0
+    cost_writer = CostFileWriter(game_dir, username) if game_dir else None
+    pacer = RequestPacer(max_rpm)
     consecutive_timeouts = 0
+    local_passes = 0  # numbers the tool_call ids of locally issued passes
+    # Full auto_pass_until_event results still in history, oldest first
+    full_pass_results: list[tuple[dict, dict]] = []
+    earlier_event = ""
 
-    while True:
-        try:
-            response = await asyncio.wait_for(
-                client.chat.completions.create(
-                    model=model,
-                    messages=messages,
-                    tools=tools,
-                    tool_choice="auto",
-                    max_tokens=MAX_TOKENS,
-                ),
-                timeout=LLM_REQUEST_TIMEOUT_SECS,
-            )
-            consecutive_timeouts = 0
-            choice = response.choices[0]
-
-            # Track token usage and cost
-            if response.usage and model_price is not None:
-                input_cost = (response.usage.prompt_tokens or 0) * model_price[0] / 1_000_000
-                output_cost = (response.usage.completion_tokens or 0) * model_price[1] / 1_000_000
-                cumulative_cost += input_cost + output_cost
-                if game_dir:
-                    write_cost_file(game_dir, username, cumulative_cost)
-
-            # If the LLM produced tool calls, process them
-            if choice.message.tool_calls:
-                messages.append(choice.message)
-
-                chatted = False
-                for tool_call in choice.message.tool_calls:
-                    fn = tool_call.function
-                    args = json.loads(fn.arguments) if fn.arguments else {}
-                    print(f"[chatterbox] Tool: {fn.name}({json.dumps(args, separators=(',', ':'))})")
-
-                    result_text = await execute_tool(session, fn.name, args)
-
-                    # Log interesting results
-                    if fn.name == "send_chat_message":
-                        chatted = True
-                        msg = args.get("message", "")
-                        result_data = json.loads(result_text)
-                        if result_data.get("success"):
-                            print(f"[chatterbox] Chat sent: {msg}")
+    try:
+        while True:
+            try:
+                await pacer.wait()
+                content, tool_calls, usage = await asyncio.wait_for(
+                    stream_completion(
+                        client,
+                        session,
+                        model=model,
+                        messages=messages,
+                        tools=tools,
+                        tool_choice="auto",
+                        max_tokens=MAX_TOKENS,
+                    ),
+                    timeout=LLM_REQUEST_TIMEOUT_SECS,
+                )
+                consecutive_timeouts = 0
+
+                # Track token usage and cost
+                if usage and model_price is not None:
+                    input_cost = (usage.prompt_tokens or 0) * model_price[0] / 1_000_000
+                    output_cost = (usage.completion_tokens or 0) * model_price[1] / 1_000_000
+                    cumulative_cost += input_cost + output_cost
+                    if cost_writer:
+                        cost_writer.update(cumulative_cost)
+
+                # If the LLM produced tool calls, process them
+                if tool_calls:
+                    messages.append({
+                        "role": "assistant",
+                        "content": content or None,
+                        "tool_calls": [call.as_message_entry() for call in tool_calls],
+                    })
+
+                    # Independent calls run concurrently; order-sensitive ones
+                    # (e.g. two chat messages) run one after another.
+                    if sum(call.name in ORDERED_TOOLS for call in tool_calls) > 1:
+                        results = [await call.result(session) for call in tool_calls]
+                    else:
+                        results = await asyncio.gather(*(call.result(session) for call in tool_calls))
+
+                    chatted = False
+                    result_data = {}
+                    for call, result_text in zip(tool_calls, results):
+                        args = call.args
+                        if verbose:
+                            print(f"[chatterbox] Tool: {call.name}({call.arguments})")
                         else:
-                            print(f"[chatterbox] Chat failed: {result_text}")
-                    elif fn.name == "auto_pass_until_event":
-                        result_data = json.loads(result_text)
+                            print(f"[chatterbox] Tool: {call.name}")
+                        result_data = parse_tool_result(result_text) if call.name in INSPECTED_RESULT_TOOLS else {}
+
+                        # Log interesting results
+                        if call.name == "send_chat_message":
+                            chatted = True
+                            msg = args.get("message", "")
+                            if result_data.get("success"):
+                                print(f"[chatterbox] Chat sent: {msg}")
+                            else:
+                                print(f"[chatterbox] Chat failed: {result_text}")
+                        elif call.name == "auto_pass_until_event":
+                            actions = result_data.get("actions_taken", 0)
+                            new_chars = result_data.get("new_chars", 0)
+                            event = result_data.get("event_occurred", False)
+                            print(f"[chatterbox] Auto-pass: {actions} actions, {new_chars} new chars, event={event}")
+
+                        tool_msg = {
+                            "role": "tool",
+                            "tool_call_id": call.id,
+                            "content": result_text,
+                        }
+                        messages.append(tool_msg)
+
+                        if call.name == "auto_pass_until_event":
+                            earlier_event = record_pass_result(full_pass_results, tool_msg, result_data, earlier_event)
+
+                    if chatted:
+                        calls_since_chat = 0
+                    else:
+                        calls_since_chat += 1
+
+                    # Nothing happened: pass again without an LLM round-trip
+                    silent_passes = 0
+                    while (not chatted and tool_calls[-1].name == "auto_pass_until_event"
+                           and result_data.get("event_occurred") is False
+                           and silent_passes < MAX_SILENT_PASSES):
+                        silent_passes += 1
+                        local_passes += 1
+                        result_text = await execute_tool(session, "auto_pass_until_event", {})
+                        result_data = parse_tool_result(result_text)
                         actions = result_data.get("actions_taken", 0)
                         new_chars = result_data.get("new_chars", 0)
                         event = result_data.get("event_occurred", False)
-                        print(f"[chatterbox] Auto-pass: {actions} actions, {new_chars} new chars, event={event}")
-
+                        print(f"[chatterbox] Auto-pass (local): {actions} actions, {new_chars} new chars, event={event}")
+
+                        call_id = f"local_pass_{local_passes}"
+                        messages.append({
+                            "role": "assistant",
+                            "content": None,
+                            "tool_calls": [{
+                                "id": call_id,
+                                "type": "function",
+                                "function": {"name": "auto_pass_until_event", "arguments": "{}"},
+                            }],
+                        })
+                        tool_msg = {"role": "tool", "tool_call_id": call_id, "content": result_text}
+                        messages.append(tool_msg)
+                        earlier_event = record_pass_result(full_pass_results, tool_msg, result_data, earlier_event)
+                else:
+                    # LLM stopped calling tools - add its text response and prompt it to continue.
+                    # Skip empty/whitespace content (Gemini Flash returns these and then
+                    # chokes on the empty "parts" field in the next request).
+                    content = content.strip()
+                    if content:
+                        print(f"[chatterbox] LLM text: {content[:200]}")
+                        messages.append({"role": "assistant", "content": content})
                     messages.append({
-                        "role": "tool",
-                        "tool_call_id": tool_call.id,
-                        "content": result_text,
+                        "role": "user",
+                        "content": "Continue your loop. Call auto_pass_until_event.",
                     })
+                    calls_since_chat += 1
 
-                if chatted:
+                # Nudge if the LLM has been quiet too long
+                if calls_since_chat >= 8:
+                    messages.append({
+                        "role": "user",
+                        "content": "You've been quiet for a while! Send a chat message reacting to what's happening.",
+                    })
                     calls_since_chat = 0
-                else:
-                    calls_since_chat += 1
-            else:
-                # LLM stopped calling tools - add its text response and prompt it to continue.
-                # Skip empty/whitespace content (Gemini Flash returns these and then
-                # chokes on the empty "parts" field in the next request).
-                content = (choice.message.content or "").strip()
-                if content:
-                    print(f"[chatterbox] LLM text: {content[:200]}")
-                    messages.append({"role": "assistant", "content": content})
-                messages.append({
-                    "role": "user",
-                    "content": "Continue your loop. Call auto_pass_until_event.",
-                })
-                calls_since_chat += 1
-
-            # Nudge if the LLM has been quiet too long
-            if calls_since_chat >= 8:
-                messages.append({
-                    "role": "user",
-                    "content": "You've been quiet for a while! Send a chat message reacting to what's happening.",
-                })
-                calls_since_chat = 0
-
-            # Trim message history to avoid unbounded growth.
-            # Keep system prompt + a personality reminder + last messages.
-            if len(messages) > 25:
-                messages = (
-                    [messages[0]]
-                    + [{"role": "user", "content": "Remember: you're an entertaining chatterbox. React to plays with short, funny chat messages. Don't just silently observe."}]
-                    + messages[-15:]
-                )
 
-        except asyncio.TimeoutError:
-            consecutive_timeouts += 1
-            print(f"[chatterbox] LLM request timed out after {LLM_REQUEST_TIMEOUT_SECS}s [{consecutive_timeouts}]")
-            try:
-                await execute_tool(session, "auto_pass_until_event", {"timeout_ms": 5000})
-            except Exception:
-                await asyncio.sleep(5)
+                # Trim message history to keep prompt size bounded.
+                # Keep system prompt + a personality reminder + newest messages.
+                if sum(estimate_tokens(m) for m in messages[1:]) > HISTORY_TOKEN_BUDGET:
+                    messages = trim_history(messages, system_msg, earlier_event)
+
+            except asyncio.TimeoutError:
+                consecutive_timeouts += 1
+                print(f"[chatterbox] LLM request timed out after {LLM_REQUEST_TIMEOUT_SECS}s [{consecutive_timeouts}]")
+                try:
+                    await execute_tool(session, "auto_pass_until_event", {"timeout_ms": 5000})
+                except Exception:
+                    await asyncio.sleep(5)
+
+                if consecutive_timeouts >= MAX_CONSECUTIVE_TIMEOUTS:
+                    print("[chatterbox] Repeated LLM timeouts, resetting conversation context")
+                    messages = [
+                        system_msg,
+                        {"role": "user", "content": "Continue playing. Call auto_pass_until_event to wait for game events."},
+                    ]
+                    calls_since_chat = 0
+                    consecutive_timeouts = 0
 
-            if consecutive_timeouts >= MAX_CONSECUTIVE_TIMEOUTS:
-                print("[chatterbox] Repeated LLM timeouts, resetting conversation context")
+            except Exception as e:
+                consecutive_timeouts = 0
+                status_code = getattr(e, "status_code", None)
+                print(f"[chatterbox] LLM error: {e}")
+
+                # Credit exhaustion - fall back to pass-only mode permanently
+                if status_code == 402 or "402" in str(e):
+                    print("[chatterbox] Credits exhausted, switching to pass-only mode")
+                    if cost_writer:
+                        cost_writer.flush()
+                    await run_pass_only(session, "chatterbox")
+                    return
+
+                # Transient error - keep actions flowing while waiting to retry
+                try:
+                    await execute_tool(session, "auto_pass_until_event", {"timeout_ms": 5000})
+                except Exception:
+                    await asyncio.sleep(5)
+
+                # Rate limits, 5xx and dropped connections say nothing about the
+                # conversation, so retry it as-is (keeping the cached prefix warm).
+                if status_code in TRANSIENT_STATUS_CODES or isinstance(e, APIConnectionError):
+                    continue
+
+                # Reset conversation on error
                 messages = [
-                    {"role": "system", "content": system_prompt},
+                    system_msg,
                     {"role": "user", "content": "Continue playing. Call auto_pass_until_event to wait for game events."},
                 ]
-                calls_since_chat = 0
-                consecutive_timeouts = 0
-
-        except Exception as e:
-            consecutive_timeouts = 0
-            error_str = str(e)
-            print(f"[chatterbox] LLM error: {e}")
-
-            # Credit exhaustion - fall back to pass-only mode permanently
-            if "402" in error_str:
-                print("[chatterbox] Credits exhausted, switching to pass-only mode")
-                while True:
-                    try:
-                        await execute_tool(session, "auto_pass_until_event", {})
-                    except Exception as pass_err:
-                        print(f"[chatterbox] Pass-only error: {pass_err}")
-                        await asyncio.sleep(5)
-
-            # Transient error - keep actions flowing while waiting to retry
-            try:
-                await execute_tool(session, "auto_pass_until_event", {"timeout_ms": 5000})
-            except Exception:
-                await asyncio.sleep(5)
-
-            # Reset conversation on error
-            messages = [
-                {"role": "system", "content": system_prompt},
-                {"role": "user", "content": "Continue playing. Call auto_pass_until_event to wait for game events."},
-            ]
+    finally:
+        # Don't leave the last few requests' cost unreported
+        if cost_writer:
+            cost_writer.flush()
 
 
 async def run_chatterbox(
@@ -231,24 +580,34 @@ async def run_chatterbox(
     username: str,
     project_root: Path,
     deck_path: Path | None = None,
+    java_argfile: Path | None = None,
     api_key: str = "",
     model: str = DEFAULT_MODEL,
     base_url: str = DEFAULT_BASE_URL,
     system_prompt: str = DEFAULT_SYSTEM_PROMPT,
     game_dir: Path | None = None,
     prices: dict[str, tuple[float, float]] | None = None,
+    verbose: bool = False,
+    max_rpm: int | None = None,
 ) -> None:
     """Run the chatterbox client."""
     print(f"[chatterbox] Starting for {username}@{server}:{port}")
     print(f"[chatterbox] Model: {model}")
     print(f"[chatterbox] Base URL: {base_url}")
 
-    # Initialize OpenAI-compatible client
+    # Initialize OpenAI-compatible client on a long-lived keep-alive pool
+    http_client = DefaultAsyncHttpxClient(
+        limits=httpx.Limits(
+            max_keepalive_connections=HTTP_MAX_KEEPALIVE_CONNECTIONS,
+            keepalive_expiry=HTTP_KEEPALIVE_EXPIRY_SECS,
+        ),
+    )
     llm_client = AsyncOpenAI(
         api_key=api_key,
         base_url=base_url,
         timeout=LLM_REQUEST_TIMEOUT_SECS + 5,
         max_retries=1,
+        http_client=http_client,
     )
 
     # Build JVM args for the skeleton (same as sleepwalker)
@@ -263,37 +622,44 @@ async def run_chatterbox(
         jvm_args_list.append("-Dapple.awt.UIElement=true")
     jvm_args = " ".join(jvm_args_list)
 
-    env = os.environ.copy()
-    env["MAVEN_OPTS"] = jvm_args
+    env = {**os.environ, "MAVEN_OPTS": jvm_args}
 
-    # Pass deck path as a Maven CLI arg (not in MAVEN_OPTS) because
-    # MAVEN_OPTS gets shell-split by the mvn script, breaking paths with spaces.
-    mvn_args = ["-q"]
-    if deck_path:
-        mvn_args.append(f"-Dxmage.headless.deck={deck_path}")
-    mvn_args.append("exec:java")
+    # Plain java when the harness resolved the classpath, else mvn exec:java
+    command, command_args = headless_command(jvm_args_list, deck_path, java_argfile)
 
     server_params = StdioServerParameters(
-        command="mvn",
-        args=mvn_args,
+        command=command,
+        args=command_args,
         cwd=str(project_root / "Mage.Client.Headless"),
         env=env,
     )
 
     print("[chatterbox] Spawning skeleton client...")
+    install_large_pipes()
 
-    async with stdio_client(server_params) as (read, write):
-        async with ClientSession(read, write) as session:
-            result = await session.initialize()
-            print(f"[chatterbox] MCP initialized: {result.serverInfo}")
+    # Do the TCP/TLS handshake while the JVM boots so the first completion
+    # finds a warm connection in the pool.
+    warm_up = asyncio.create_task(warm_up_connection(http_client, base_url))
+
+    async with llm_client:
+        try:
+            async with stdio_client(server_params) as (read, write):
+                async with ClientSession(read, write) as session:
+                    result = await session.initialize()
+                    print(f"[chatterbox] MCP initialized: {result.serverInfo}")
 
-            tools_result = await session.list_tools()
-            openai_tools = mcp_tools_to_openai(tools_result.tools)
-            print(f"[chatterbox] Available tools: {[t.name for t in tools_result.tools]}")
+                    tools_result = await session.list_tools()
+                    openai_tools = mcp_tools_to_openai(tools_result.tools)
+                    print(f"[chatterbox] Available tools: {[t.name for t in tools_result.tools]}")
 
-            print("[chatterbox] Starting LLM loop...")
-            await run_llm_loop(session, llm_client, model, system_prompt, openai_tools,
-                               username=username, game_dir=game_dir, prices=prices)
+                    await warm_up
+                    print("[chatterbox] Starting LLM loop...")
+                    await run_llm_loop(session, llm_client, model, system_prompt, openai_tools,
+                                       username=username, game_dir=game_dir, prices=prices, verbose=verbose,
+                                       max_rpm=max_rpm)
+        finally:
+            # No-op once awaited; otherwise the skeleton client never came up
+            warm_up.cancel()
 
 
 def main() -> int:
@@ -304,11 +670,14 @@ def main() -> int:
     parser.add_argument("--username", default="Chatty", help="Player username")
     parser.add_argument("--project-root", type=Path, help="Project root directory")
     parser.add_argument("--deck", type=Path, help="Path to deck file (.dck)")
+    parser.add_argument("--java-argfile", type=Path, help="java @argfile with the headless client classpath (default: mvn exec:java)")
     parser.add_argument("--api-key", default="", help="API key (prefer OPENROUTER_API_KEY env var)")
     parser.add_argument("--model", default=DEFAULT_MODEL, help=f"LLM model (default: {DEFAULT_MODEL})")
     parser.add_argument("--base-url", default=DEFAULT_BASE_URL, help=f"API base URL (default: {DEFAULT_BASE_URL})")
     parser.add_argument("--system-prompt", default=DEFAULT_SYSTEM_PROMPT, help="Custom system prompt")
     parser.add_argument("--game-dir", type=Path, help="Game directory for cost file output")
+    parser.add_argument("--verbose", action="store_true", help="Log full tool call arguments")
+    parser.add_argument("--max-rpm", type=int, help="Max LLM requests per minute (default: no limit)")
     args = parser.parse_args()
 
     # Determine project root
@@ -332,19 +701,26 @@ def main() -> int:
     prices = load_prices()
     print(f"[chatterbox] Project root: {project_root}")
 
+    exit_on_sigterm()
+    # uvloop is declared everywhere but Windows; there, and on installs that
+    # skipped it, run on asyncio's own loop
+    run = getattr(uvloop, "run", None) or asyncio.run
     try:
-        asyncio.run(run_chatterbox(
+        run(run_chatterbox(
             server=args.server,
             port=args.port,
             username=args.username,
             project_root=project_root,
             deck_path=args.deck,
+            java_argfile=args.java_argfile,
             api_key=api_key,
             model=args.model,
             base_url=args.base_url,
             system_prompt=args.system_prompt,
             game_dir=args.game_dir,
             prices=prices,
+            verbose=args.verbose,
+            max_rpm=args.max_rpm,
         ))
     except KeyboardInterrupt:
         pass
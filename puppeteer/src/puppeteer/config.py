@@ -1,5 +1,6 @@
 """Configuration for the AI harness."""
 
+import functools
 import random
 import sys
 from dataclasses import dataclass, field
@@ -44,6 +45,7 @@ class ChatterboxPlayer:
     model: str | None = None  # LLM model (e.g., "anthropic/claude-sonnet-4")
     base_url: str | None = None  # API base URL (e.g., "https://openrouter.ai/api/v1")
     system_prompt: str | None = None  # Custom system prompt
+    rpm: int | None = None  # Max LLM requests per minute (None = no limit)
 
 
 @dataclass
@@ -63,6 +65,13 @@ class CpuPlayer:
     deck: str | None = None  # Path to .dck file, relative to project root
 
 
+@functools.lru_cache(maxsize=4)
+def list_commander_decks(project_root: Path) -> tuple[Path, ...]:
+    """Commander sample decks, relative to project_root (scanned once per root)."""
+    commander_dir = project_root / "Mage.Client" / "release" / "sample-decks" / "Commander"
+    return tuple(p.relative_to(project_root) for p in commander_dir.rglob("*.dck"))
+
+
 # Union type for all player types
 Player = Union[
     PotatoPlayer,
@@ -89,7 +98,7 @@ class Config:
     log_dir: Path = field(default_factory=lambda: Path.home() / "mage-logs")
     jvm_opens: str = "--add-opens=java.base/java.io=ALL-UNNAMED"
 
-    @property
+    @functools.cached_property
     def jvm_headless_opts(self) -> str:
         """JVM options for headless (non-GUI) processes."""
         opts = [self.jvm_opens]
@@ -113,6 +122,7 @@ class Config:
     # Runtime state (set during execution)
     port: int = 0
     timestamp: str = ""
+    java_argfiles: dict[str, Path] = field(default_factory=dict)  # module -> java @argfile
 
     # Player lists by type
     potato_players: list[PotatoPlayer] = field(default_factory=list)
@@ -161,6 +171,7 @@ class Config:
                         model=player.get("model"),
                         base_url=player.get("base_url"),
                         system_prompt=player.get("system_prompt"),
+                        rpm=player.get("rpm"),
                     ))
                 elif player_type == "pilot":
                     self.pilot_players.append(PilotPlayer(
@@ -180,74 +191,50 @@ class Config:
                     # Legacy: treat as potato for backwards compatibility
                     self.potato_players.append(PotatoPlayer(name=name, deck=deck))
 
+    def _players_by_type(self) -> list[tuple[str, list]]:
+        """Player lists paired with their config type, in observer seat order."""
+        return [
+            ("pilot", self.pilot_players),
+            ("chatterbox", self.chatterbox_players),
+            ("sleepwalker", self.sleepwalker_players),
+            ("potato", self.potato_players),
+            ("staller", self.staller_players),
+            ("cpu", self.cpu_players),
+            ("skeleton", self.skeleton_players),
+        ]
+
     def get_players_config_json(self) -> str:
         """Serialize resolved player config to JSON for passing to observer/GUI client."""
         players = []
-        for p in self.pilot_players:
-            d = {"type": "pilot", "name": p.name}
-            if p.deck:
-                d["deck"] = p.deck
-            if p.model:
-                d["model"] = p.model
-            players.append(d)
-        for p in self.chatterbox_players:
-            d = {"type": "chatterbox", "name": p.name}
-            if p.deck:
-                d["deck"] = p.deck
-            if p.model:
-                d["model"] = p.model
-            players.append(d)
-        for p in self.sleepwalker_players:
-            d = {"type": "sleepwalker", "name": p.name}
-            if p.deck:
-                d["deck"] = p.deck
-            players.append(d)
-        for p in self.potato_players:
-            d = {"type": "potato", "name": p.name}
-            if p.deck:
-                d["deck"] = p.deck
-            players.append(d)
-        for p in self.staller_players:
-            d = {"type": "staller", "name": p.name}
-            if p.deck:
-                d["deck"] = p.deck
-            players.append(d)
-        for p in self.cpu_players:
-            d = {"type": "cpu", "name": p.name}
-            if p.deck:
-                d["deck"] = p.deck
-            players.append(d)
-        for p in self.skeleton_players:
-            d = {"type": "skeleton", "name": p.name}
-            if p.deck:
-                d["deck"] = p.deck
-            players.append(d)
+        for player_type, typed_players in self._players_by_type():
+            for p in typed_players:
+                d = {"type": player_type, "name": p.name}
+                if p.deck:
+                    d["deck"] = p.deck
+                if getattr(p, "model", None):
+                    d["model"] = p.model
+                players.append(d)
         if not players:
             return ""
         return json.dumps({"players": players}, separators=(',', ':'))
 
     def resolve_random_decks(self, project_root: Path) -> None:
         """Replace any deck="random" with a randomly chosen Commander .dck file."""
-        all_players = (
-            self.potato_players +
-            self.staller_players +
-            self.sleepwalker_players +
-            self.chatterbox_players +
-            self.pilot_players +
-            self.cpu_players +
-            self.skeleton_players
-        )
-        if not any(p.deck == "random" for p in all_players):
+        random_players = [
+            p
+            for _, typed_players in self._players_by_type()
+            for p in typed_players
+            if p.deck == "random"
+        ]
+        if not random_players:
             return
 
-        commander_dir = project_root / "Mage.Client" / "release" / "sample-decks" / "Commander"
-        decks = [p.relative_to(project_root) for p in commander_dir.rglob("*.dck")]
+        decks = list_commander_decks(project_root)
         if not decks:
             print("WARNING: No .dck files found in Commander directory, keeping 'random' as-is")
             return
 
-        for player in all_players:
-            if player.deck == "random":
-                chosen = random.choice(decks)
-                player.deck = str(chosen)
-                print(f"Random deck for {player.name}: {chosen.name}")
+        for player in random_players:
+            chosen = random.choice(decks)
+            player.deck = str(chosen)
+            print(f"Random deck for {player.name}: {chosen.name}")
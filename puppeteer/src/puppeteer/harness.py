@@ -3,20 +3,64 @@
 import argparse
 import json
 import os
-import shutil
+import queue
+import socket
 import subprocess
 import sys
+import threading
 import time
-from datetime import datetime
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
 from pathlib import Path
 
 from puppeteer.config import ChatterboxPlayer, PilotPlayer, Config
+from puppeteer.java_launch import java_command, maven_executable, resolve_java_argfiles
 from puppeteer.llm_cost import DEFAULT_BASE_URL as DEFAULT_LLM_BASE_URL, required_api_key_env
-from puppeteer.port import can_bind_port, find_available_port, wait_for_port
+from puppeteer.port import find_available_port, wait_for_port
 from puppeteer.process_manager import ProcessManager
 from puppeteer.xml_config import modify_server_config
 
 _OBSERVER_TABLE_READY = "AI Harness: waiting for"
+# Every line the observer logs while setting up the table; its window is up by then
+_OBSERVER_HARNESS_LOG = "AI Harness:"
+_OBSERVER_LOG_POLL_SECS = 0.25
+_FOREGROUND_TIMEOUT_SECS = 120
+
+
+def _wait_for_log_marker(
+    log_path: Path, proc: subprocess.Popen, marker: str, timeout: float
+) -> bool:
+    """Poll a process's log until marker appears.
+
+    Returns False if the process exits or the timeout passes first.
+    """
+    marker_bytes = marker.encode()
+    # Bytes carried between reads, so a marker split across two is still found.
+    # At least one, since data[-0:] would carry the whole buffer.
+    keep = max(len(marker_bytes) - 1, 1)
+    deadline = time.monotonic() + timeout
+    log_file = None
+    tail = b""
+    try:
+        while time.monotonic() < deadline:
+            if proc.poll() is not None:
+                return False
+            if log_file is None:
+                try:
+                    log_file = log_path.open("rb")
+                except FileNotFoundError:
+                    pass
+            if log_file is not None:
+                # Read only what was appended since the last pass
+                data = tail + log_file.read()
+                if marker_bytes in data:
+                    return True
+                tail = data[-keep:]
+            time.sleep(_OBSERVER_LOG_POLL_SECS)
+    finally:
+        if log_file is not None:
+            log_file.close()
+    return False
 
 
 def _wait_for_observer_table(
@@ -29,42 +73,105 @@ def _wait_for_observer_table(
     log file for that marker so headless clients aren't started before the
     table exists.
     """
-    deadline = time.monotonic() + timeout
-    while time.monotonic() < deadline:
-        if proc.poll() is not None:
-            raise RuntimeError(
-                "Observer process exited before creating the game table"
-            )
-        if log_path.exists():
-            text = log_path.read_text()
-            if _OBSERVER_TABLE_READY in text:
-                return
-        time.sleep(2)
+    if _wait_for_log_marker(log_path, proc, _OBSERVER_TABLE_READY, timeout):
+        return
+    if proc.poll() is not None:
+        raise RuntimeError(
+            "Observer process exited before creating the game table"
+        )
     raise TimeoutError(
         f"Observer did not create a table within {timeout}s — check {log_path}"
     )
 
 
+def _wait_for_first_exit(
+    procs: dict[str, subprocess.Popen],
+    others: dict[str, subprocess.Popen] | None = None,
+) -> str:
+    """Block until any of the named processes exits and return its name.
+
+    Processes in `others` don't end the wait; they are reaped and reported
+    as they exit, so a crashed client shows up in the harness output at
+    once.  Each process gets a daemon thread blocked in wait(), so this
+    wakes as soon as the kernel reports an exit, without polling, and the
+    threads left waiting never hold up interpreter exit.
+    """
+    exits: queue.Queue[tuple[str, bool, int]] = queue.Queue()
+
+    def reap(name: str, proc: subprocess.Popen, ends_wait: bool) -> None:
+        exits.put((name, ends_wait, proc.wait()))
+
+    for name, proc in (others or {}).items():
+        threading.Thread(target=reap, args=(name, proc, False), daemon=True).start()
+    for name, proc in procs.items():
+        threading.Thread(target=reap, args=(name, proc, True), daemon=True).start()
+    while True:
+        name, ends_wait, returncode = exits.get()
+        if ends_wait:
+            return name
+        print(f"{name} exited with code {returncode}")
+
+
+def _llm_api_key(player: ChatterboxPlayer | PilotPlayer) -> tuple[str, str]:
+    """Return (env var name, value) of the API key an LLM player needs."""
+    key_env = required_api_key_env(player.base_url or DEFAULT_LLM_BASE_URL)
+    return key_env, os.environ.get(key_env, "")
+
+
+def _git_provenance(project_root: Path) -> dict:
+    """Return branch, commit and the last 10 commit lines from a single git call."""
+    try:
+        out = subprocess.check_output(
+            ["git", "log", "-10", "--format=%H%x00%D%x00%h %s", "HEAD"],
+            cwd=project_root, stderr=subprocess.DEVNULL, encoding="utf-8", errors="replace",
+        )
+    except Exception:
+        out = ""
+    entries = [line.split("\0", 2) for line in out.splitlines()]
+    if not entries:
+        return {"branch": "", "commit": "", "commit_log": []}
+
+    commit, decoration = entries[0][0], entries[0][1]
+    # "HEAD -> main, origin/main" on a branch; just "HEAD" when detached,
+    # matching what `git rev-parse --abbrev-ref HEAD` reports.
+    branch = "HEAD"
+    for ref in decoration.split(", "):
+        if ref.startswith("HEAD -> "):
+            branch = ref[len("HEAD -> "):]
+            break
+    return {
+        "branch": branch,
+        "commit": commit,
+        "commit_log": [entry[2] for entry in entries],
+    }
+
+
 def _missing_llm_api_keys(config: Config) -> list[str]:
     """Return validation errors for LLM players missing required API keys."""
     errors: list[str] = []
     llm_players = [*config.chatterbox_players, *config.pilot_players]
     for player in llm_players:
         base_url = player.base_url or DEFAULT_LLM_BASE_URL
-        key_env = required_api_key_env(base_url)
-        if not os.environ.get(key_env, "").strip():
+        key_env, api_key = _llm_api_key(player)
+        if not api_key.strip():
             errors.append(
                 f"{player.name} ({base_url}) requires {key_env}"
             )
     return errors
 
 
-def bring_to_foreground_macos() -> None:
-    """Bring the Java app to foreground on macOS using AppleScript."""
+def bring_to_foreground_macos(log_path: Path, proc: subprocess.Popen) -> None:
+    """Bring the Java app to foreground on macOS using AppleScript.
+
+    Waits for the observer's first table-setup log line rather than a fixed
+    delay, so the window is actually showing when it's raised.
+    """
     if sys.platform != "darwin":
         return
 
-    time.sleep(2)  # Wait for window to appear
+    _wait_for_log_marker(log_path, proc, _OBSERVER_HARNESS_LOG, _FOREGROUND_TIMEOUT_SECS)
+    if proc.poll() is not None:
+        return
 
     subprocess.run(
         [
@@ -172,57 +279,155 @@ def parse_args() -> Config:
     return config
 
 
-def compile_project(project_root: Path, streaming: bool = False) -> bool:
-    """Compile the project using Maven."""
-    print("Compiling project...")
-    modules = "Mage.Server,Mage.Client,Mage.Client.Headless"
-    if streaming:
-        modules += ",Mage.Client.Streaming"
+def compile_project(pm: ProcessManager, project_root: Path, modules: list[str]) -> bool:
+    """Compile the given modules (and what they depend on) using Maven."""
+    print(f"Compiling project ({maven_executable()})...")
 
-    result = subprocess.run(
+    proc = pm.track(subprocess.Popen(
         [
-            "mvn",
+            maven_executable(),
             "-q",
             "-DskipTests",
             "-pl",
-            modules,
+            ",".join(modules),
             "-am",
             "install",
         ],
         cwd=project_root,
-    )
-    return result.returncode == 0
+    ))
+    return proc.wait() == 0
 
 
-def refresh_streaming_resources(project_root: Path) -> bool:
+def refresh_streaming_resources(pm: ProcessManager, project_root: Path) -> bool:
     """Refresh streaming client resources under target/classes.
 
     This keeps overlay static files in sync even when --skip-compile is used.
     """
-    result = subprocess.run(
+    proc = pm.track(subprocess.Popen(
         [
-            "mvn",
+            maven_executable(),
             "-q",
             "-pl",
             "Mage.Client.Streaming",
             "resources:resources",
         ],
         cwd=project_root,
-    )
-    return result.returncode == 0
+    ))
+    return proc.wait() == 0
+
+
+def _build_project(
+    pm: ProcessManager, project_root: Path, modules: list[str], streaming: bool
+) -> bool:
+    """Compile, then refresh streaming resources; print the error and return False on failure."""
+    if not compile_project(pm, project_root, modules):
+        print("ERROR: Compilation failed")
+        return False
+
+    if streaming:
+        print("Refreshing streaming resources...")
+        if not refresh_streaming_resources(pm, project_root):
+            print("ERROR: Failed to refresh streaming resources")
+            return False
+    return True
 
 
 def find_available_overlay_port(start_port: int, max_attempts: int = 100) -> int:
     """Find a free local port for the overlay server."""
-    for offset in range(max_attempts):
-        port = start_port + offset
-        if can_bind_port(port):
+    # A failed bind leaves the socket unbound, so one socket probes the range
+    with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as sock:
+        for offset in range(max_attempts):
+            port = start_port + offset
+            try:
+                sock.bind(("", port))
+            except OSError:
+                continue
             return port
     raise RuntimeError(
         f"No available overlay port found in range {start_port}-{start_port + max_attempts - 1}"
     )
 
 
+def _harness_env(config: Config) -> dict[str, str]:
+    """Environment shared by the server and observer processes."""
+    return {
+        "XMAGE_AI_HARNESS": "1",
+        "XMAGE_AI_HARNESS_USER": config.user,
+        "XMAGE_AI_HARNESS_PASSWORD": config.password,
+        "XMAGE_AI_HARNESS_SERVER": config.server,
+        "XMAGE_AI_HARNESS_PORT": str(config.port),
+        "XMAGE_AI_HARNESS_DISABLE_WHATS_NEW": "1",
+    }
+
+
+def _observer_jvm_args(config: Config) -> list[str]:
+    """JVM flags that make an observer client (GUI or streaming) auto-connect and start the game."""
+    return [
+        config.jvm_opens,
+        "-Dxmage.aiHarness.autoConnect=true",
+        "-Dxmage.aiHarness.autoStart=true",
+        "-Dxmage.aiHarness.disableWhatsNew=true",
+        f"-Dxmage.aiHarness.server={config.server}",
+        f"-Dxmage.aiHarness.port={config.port}",
+        f"-Dxmage.aiHarness.user={config.user}",
+        f"-Dxmage.aiHarness.password={config.password}",
+    ]
+
+
+def _observer_env(
+    config: Config, players_config_file: Path | None, launch_env: dict[str, str]
+) -> dict[str, str]:
+    """Environment for an observer client (GUI or streaming)."""
+    env = {
+        **_harness_env(config),
+        **_players_config_env(config, players_config_file),
+        **launch_env,
+    }
+    if config.match_time_limit:
+        env["XMAGE_AI_HARNESS_MATCH_TIME_LIMIT"] = config.match_time_limit
+    if config.match_buffer_time:
+        env["XMAGE_AI_HARNESS_MATCH_BUFFER_TIME"] = config.match_buffer_time
+    return env
+
+
+def _write_players_config(config: Config, project_root: Path, path: Path) -> Path:
+    """Resolve "random" decks, then serialize the player config once to path."""
+    config.resolve_random_decks(project_root)
+    path.write_text(config.get_players_config_json())
+    return path
+
+
+def _players_config_env(config: Config, players_config_file: Path | None) -> dict[str, str]:
+    """Env handing the resolved player config (actual decks, not "random") to an observer.
+
+    The harness passes the file written by _write_players_config so the JSON
+    isn't copied into each child's environment; standalone callers get it inline.
+    """
+    if players_config_file is not None:
+        return {"XMAGE_AI_HARNESS_PLAYERS_CONFIG_FILE": str(players_config_file)}
+    return {"XMAGE_AI_HARNESS_PLAYERS_CONFIG": config.get_players_config_json()}
+
+
+def _module_launch(
+    config: Config,
+    module: str,
+    jvm_args: list[str],
+    system_props: list[str] | None = None,
+) -> tuple[list[str], dict[str, str]]:
+    """Return (command, env overrides) that run an XMage module's main class.
+
+    Uses plain `java` when the module's classpath was resolved for this run,
+    otherwise `mvn exec:java` with the JVM args in MAVEN_OPTS.  system_props
+    may contain spaces (e.g. deck paths); the mvn script shell-splits
+    MAVEN_OPTS, so on that path they go on the Maven command line instead.
+    """
+    system_props = system_props or []
+    argfile = config.java_argfiles.get(module)
+    if argfile:
+        return java_command(module, argfile, [*jvm_args, *system_props]), {}
+    return ["mvn", "-q", *system_props, "exec:java"], {"MAVEN_OPTS": " ".join(jvm_args)}
+
+
 def start_server(
     pm: ProcessManager,
     project_root: Path,
@@ -238,24 +443,17 @@ def start_server(
     - Extended idle timeouts
     - Skipped user stats operations
     """
-    jvm_args = " ".join([
-        config.jvm_headless_opts,
-        "-Dxmage.testMode=true",
-        f"-Dxmage.config.path={config_path}",
-    ])
+    args, launch_env = _module_launch(
+        config,
+        "Mage.Server",
+        [*config.jvm_headless_opts.split(), "-Dxmage.testMode=true"],
+        [f"-Dxmage.config.path={config_path}"],
+    )
 
-    env = {
-        "XMAGE_AI_HARNESS": "1",
-        "XMAGE_AI_HARNESS_USER": config.user,
-        "XMAGE_AI_HARNESS_PASSWORD": config.password,
-        "XMAGE_AI_HARNESS_SERVER": config.server,
-        "XMAGE_AI_HARNESS_PORT": str(config.port),
-        "XMAGE_AI_HARNESS_DISABLE_WHATS_NEW": "1",
-        "MAVEN_OPTS": jvm_args,
-    }
+    env = {**_harness_env(config), **launch_env}
 
     return pm.start_process(
-        args=["mvn", "-q", "exec:java"],
+        args=args,
         cwd=project_root / "Mage.Server",
         env=env,
         log_file=log_path,
@@ -267,39 +465,15 @@ def start_gui_client(
     project_root: Path,
     config: Config,
     log_path: Path,
+    players_config_file: Path | None = None,
 ) -> subprocess.Popen:
     """Start the GUI client."""
-    # Pass resolved player config (with actual deck paths, not "random")
-    config_json = config.get_players_config_json()
-
-    jvm_args = " ".join([
-        config.jvm_opens,
-        "-Dxmage.aiHarness.autoConnect=true",
-        "-Dxmage.aiHarness.autoStart=true",
-        "-Dxmage.aiHarness.disableWhatsNew=true",
-        f"-Dxmage.aiHarness.server={config.server}",
-        f"-Dxmage.aiHarness.port={config.port}",
-        f"-Dxmage.aiHarness.user={config.user}",
-        f"-Dxmage.aiHarness.password={config.password}",
-    ])
+    args, launch_env = _module_launch(config, "Mage.Client", _observer_jvm_args(config))
 
-    env = {
-        "XMAGE_AI_HARNESS": "1",
-        "XMAGE_AI_HARNESS_USER": config.user,
-        "XMAGE_AI_HARNESS_PASSWORD": config.password,
-        "XMAGE_AI_HARNESS_SERVER": config.server,
-        "XMAGE_AI_HARNESS_PORT": str(config.port),
-        "XMAGE_AI_HARNESS_DISABLE_WHATS_NEW": "1",
-        "XMAGE_AI_HARNESS_PLAYERS_CONFIG": config_json,
-        "MAVEN_OPTS": jvm_args,
-    }
-    if config.match_time_limit:
-        env["XMAGE_AI_HARNESS_MATCH_TIME_LIMIT"] = config.match_time_limit
-    if config.match_buffer_time:
-        env["XMAGE_AI_HARNESS_MATCH_BUFFER_TIME"] = config.match_buffer_time
+    env = _observer_env(config, players_config_file, launch_env)
 
     return pm.start_process(
-        args=["mvn", "-q", "exec:java"],
+        args=args,
         cwd=project_root / "Mage.Client",
         env=env,
         log_file=log_path,
@@ -329,26 +503,23 @@ def start_potato_client(
 ) -> subprocess.Popen:
     """Start an auto-responder headless client (potato/staller)."""
     jvm_args_list = [
-        config.jvm_headless_opts,
+        *config.jvm_headless_opts.split(),
         f"-Dxmage.headless.server={config.server}",
         f"-Dxmage.headless.port={config.port}",
         f"-Dxmage.headless.username={name}",
         f"-Dxmage.headless.personality={personality}",
     ]
 
-    jvm_args = " ".join(jvm_args_list)
-    env = {"MAVEN_OPTS": jvm_args}
-
-    # Pass deck path as a Maven CLI arg (not in MAVEN_OPTS) because
-    # MAVEN_OPTS gets shell-split by the mvn script, breaking paths with spaces.
-    mvn_args = ["mvn", "-q"]
+    # The deck path may contain spaces, so it is kept out of MAVEN_OPTS
+    system_props = []
     if deck_path:
         resolved_path = project_root / deck_path
-        mvn_args.append(f"-Dxmage.headless.deck={resolved_path}")
-    mvn_args.append("exec:java")
+        system_props.append(f"-Dxmage.headless.deck={resolved_path}")
+
+    args, env = _module_launch(config, "Mage.Client.Headless", jvm_args_list, system_props)
 
     return pm.start_process(
-        args=mvn_args,
+        args=args,
         cwd=project_root / "Mage.Client.Headless",
         env=env,
         log_file=log_path,
@@ -367,8 +538,6 @@ def start_sleepwalker_client(
 
     This spawns the sleepwalker.py script which in turn spawns the skeleton.
     """
-    import sys
-
     env = {
         "PYTHONUNBUFFERED": "1",
     }
@@ -384,6 +553,9 @@ def start_sleepwalker_client(
 
     if deck_path:
         args.extend(["--deck", str(project_root / deck_path)])
+    headless_argfile = config.java_argfiles.get("Mage.Client.Headless")
+    if headless_argfile:
+        args.extend(["--java-argfile", str(headless_argfile)])
 
     return pm.start_process(
         args=args,
@@ -405,16 +577,12 @@ def start_chatterbox_client(
 
     This spawns the chatterbox.py script which in turn spawns the skeleton.
     """
-    import os
-    import sys
-
     env = {
         "PYTHONUNBUFFERED": "1",
     }
 
     # Pass the provider-specific API key based on player's base_url
-    key_env = required_api_key_env(player.base_url or DEFAULT_LLM_BASE_URL)
-    api_key = os.environ.get(key_env, "")
+    key_env, api_key = _llm_api_key(player)
     if api_key:
         env[key_env] = api_key
 
@@ -435,8 +603,13 @@ def start_chatterbox_client(
         args.extend(["--base-url", player.base_url])
     if player.system_prompt:
         args.extend(["--system-prompt", player.system_prompt])
+    if player.rpm:
+        args.extend(["--max-rpm", str(player.rpm)])
     if game_dir:
         args.extend(["--game-dir", str(game_dir)])
+    headless_argfile = config.java_argfiles.get("Mage.Client.Headless")
+    if headless_argfile:
+        args.extend(["--java-argfile", str(headless_argfile)])
 
     return pm.start_process(
         args=args,
@@ -458,16 +631,12 @@ def start_pilot_client(
 
     This spawns the pilot.py script which in turn spawns the skeleton.
     """
-    import os
-    import sys
-
     env = {
         "PYTHONUNBUFFERED": "1",
     }
 
     # Pass the provider-specific API key based on player's base_url
-    key_env = required_api_key_env(player.base_url or DEFAULT_LLM_BASE_URL)
-    api_key = os.environ.get(key_env, "")
+    key_env, api_key = _llm_api_key(player)
     if api_key:
         env[key_env] = api_key
 
@@ -490,6 +659,9 @@ def start_pilot_client(
         args.extend(["--system-prompt", player.system_prompt])
     if game_dir:
         args.extend(["--game-dir", str(game_dir)])
+    headless_argfile = config.java_argfiles.get("Mage.Client.Headless")
+    if headless_argfile:
+        args.extend(["--java-argfile", str(headless_argfile)])
 
     return pm.start_process(
         args=args,
@@ -505,25 +677,14 @@ def start_streaming_client(
     config: Config,
     log_path: Path,
     game_dir: Path | None = None,
+    players_config_file: Path | None = None,
 ) -> subprocess.Popen:
     """Start the streaming observer client.
 
     This client automatically requests hand permission from all players,
     making it suitable for Twitch streaming where viewers should see all hands.
     """
-    # Pass resolved player config (with actual deck paths, not "random")
-    config_json = config.get_players_config_json()
-
-    jvm_args_list = [
-        config.jvm_opens,
-        "-Dxmage.aiHarness.autoConnect=true",
-        "-Dxmage.aiHarness.autoStart=true",
-        "-Dxmage.aiHarness.disableWhatsNew=true",
-        f"-Dxmage.aiHarness.server={config.server}",
-        f"-Dxmage.aiHarness.port={config.port}",
-        f"-Dxmage.aiHarness.user={config.user}",
-        f"-Dxmage.aiHarness.password={config.password}",
-    ]
+    jvm_args_list = _observer_jvm_args(config)
 
     # Add game directory for cost file polling
     if game_dir:
@@ -531,7 +692,7 @@ def start_streaming_client(
 
     # Add recording path if configured
     if config.record:
-        resolved_game_dir = game_dir or (project_root / config.log_dir / f"game_{config.timestamp}").resolve()
+        resolved_game_dir = game_dir or project_root / config.log_dir / f"game_{config.timestamp}"
         record_path = config.record_output or (resolved_game_dir / "recording.mov")
         jvm_args_list.append(f"-Dxmage.streaming.record={record_path}")
 
@@ -540,25 +701,12 @@ def start_streaming_client(
     jvm_args_list.append(f"-Dxmage.streaming.overlay.port={config.overlay_port}")
     jvm_args_list.append(f"-Dxmage.streaming.overlay.host={config.overlay_host}")
 
-    jvm_args = " ".join(jvm_args_list)
+    args, launch_env = _module_launch(config, "Mage.Client.Streaming", jvm_args_list)
 
-    env = {
-        "XMAGE_AI_HARNESS": "1",
-        "XMAGE_AI_HARNESS_USER": config.user,
-        "XMAGE_AI_HARNESS_PASSWORD": config.password,
-        "XMAGE_AI_HARNESS_SERVER": config.server,
-        "XMAGE_AI_HARNESS_PORT": str(config.port),
-        "XMAGE_AI_HARNESS_DISABLE_WHATS_NEW": "1",
-        "XMAGE_AI_HARNESS_PLAYERS_CONFIG": config_json,
-        "MAVEN_OPTS": jvm_args,
-    }
-    if config.match_time_limit:
-        env["XMAGE_AI_HARNESS_MATCH_TIME_LIMIT"] = config.match_time_limit
-    if config.match_buffer_time:
-        env["XMAGE_AI_HARNESS_MATCH_BUFFER_TIME"] = config.match_buffer_time
+    env = _observer_env(config, players_config_file, launch_env)
 
     return pm.start_process(
-        args=["mvn", "-q", "exec:java"],
+        args=args,
         cwd=project_root / "Mage.Client.Streaming",
         env=env,
         log_file=log_path,
@@ -567,6 +715,10 @@ def start_streaming_client(
 
 def main() -> int:
     """Main harness orchestration."""
+    # Only needed for a real run; keep `import puppeteer.harness` light
+    import shutil
+    from datetime import datetime
+
     config = parse_args()
     project_root = Path.cwd().resolve()
     pm = ProcessManager()
@@ -593,26 +745,42 @@ def main() -> int:
         # Create log directory structure:
         #   ~/mage-logs/                       (top-level, persists across workspaces)
         #   ~/mage-logs/game_TS/               (per-game directory)
-        log_dir = (project_root / config.log_dir).resolve()
+        log_dir = project_root / config.log_dir
         log_dir.mkdir(parents=True, exist_ok=True)
         game_dir = log_dir / f"game_{config.timestamp}"
         game_dir.mkdir(parents=True, exist_ok=True)
 
-        # Write provenance manifest
-        def _git(cmd: str) -> str:
-            try:
-                return subprocess.check_output(
-                    f"git {cmd}", shell=True, cwd=project_root,
-                    stderr=subprocess.DEVNULL, text=True,
-                ).strip()
-            except Exception:
-                return ""
+        # Count headless clients (sleepwalker, chatterbox, pilot, potato, legacy skeleton)
+        headless_count = (
+            len(config.sleepwalker_players) +
+            len(config.chatterbox_players) +
+            len(config.pilot_players) +
+            len(config.potato_players) +
+            len(config.staller_players) +
+            len(config.skeleton_players)  # Legacy
+        )
 
+        # Only build and launch the modules this run uses: the server, one
+        # observer, and the headless client if any player needs it.  Maven's
+        # -am still builds whatever those depend on.
+        xmage_modules = [
+            "Mage.Server",
+            "Mage.Client.Streaming" if config.streaming else "Mage.Client",
+        ]
+        if headless_count > 0:
+            xmage_modules.append("Mage.Client.Headless")
+
+        # Maven dominates startup; write the manifest while it runs rather
+        # than after.  The build's mvn processes are tracked by pm, so if
+        # anything fails before the result is read, cleanup below kills them.
+        build_executor = ThreadPoolExecutor(max_workers=1)
+        build_future = build_executor.submit(_build_project, pm, project_root, xmage_modules, config.streaming)
+        build_executor.shutdown(wait=False)
+
+        # Write provenance manifest
         manifest = {
             "timestamp": config.timestamp,
-            "branch": _git("rev-parse --abbrev-ref HEAD"),
-            "commit": _git("rev-parse HEAD"),
-            "commit_log": _git("log --oneline -10").splitlines(),
+            **_git_provenance(project_root),
             "command": sys.argv,
             "config_file": str(config.config_file) if config.config_file else None,
         }
@@ -620,18 +788,19 @@ def main() -> int:
             json.dumps(manifest, indent=2) + "\n"
         )
 
-        # Compile if needed
-        if not compile_project(project_root, streaming=config.streaming):
-            print("ERROR: Compilation failed")
+        if not build_future.result():
             return 1
 
-        if config.streaming:
-            print("Refreshing streaming resources...")
-            if not refresh_streaming_resources(project_root):
-                print("ERROR: Failed to refresh streaming resources")
-                return 1
+        # Resolve runtime classpaths once so clients start on plain java
+        # rather than paying for `mvn exec:java` on every launch.
+        print("Resolving Java classpaths...")
+        config.java_argfiles = resolve_java_argfiles(project_root, xmage_modules)
+        for module in xmage_modules:
+            if module not in config.java_argfiles:
+                print(f"WARNING: Could not resolve {module} classpath, launching it via mvn exec:java")
 
-        # Find available port
+        # Ports are only probed, not held, so pick them now that the build is
+        # done: another harness run could claim one during a long compile.
         print(f"Finding available port starting from {config.start_port}...")
         config.port = find_available_port(config.server, config.start_port)
         print(f"Using port {config.port}")
@@ -657,10 +826,19 @@ def main() -> int:
         server_log = game_dir / "server.log"
         observer_log = game_dir / "observer.log"
 
-        # Update "last" symlink to point to this game directory
+        # Update "last" symlink to point to this game directory.  Swap in a
+        # temp link with rename so readers never see "last" missing.
         last_link = log_dir / "last"
-        last_link.unlink(missing_ok=True)
-        last_link.symlink_to(game_dir.name)
+        tmp_link = log_dir / f".last.{os.getpid()}"
+        tmp_link.unlink(missing_ok=True)
+        tmp_link.symlink_to(game_dir.name)
+        try:
+            os.replace(tmp_link, last_link)
+        except OSError:
+            # Windows can't rename over an existing link
+            tmp_link.unlink(missing_ok=True)
+            last_link.unlink(missing_ok=True)
+            last_link.symlink_to(game_dir.name)
 
         print(f"Game logs: {game_dir}")
         print(f"Server log: {server_log}")
@@ -676,23 +854,34 @@ def main() -> int:
 
         # Start server
         print("Starting XMage server...")
-        start_server(pm, project_root, config, server_config_path, server_log)
+        server_proc = start_server(pm, project_root, config, server_config_path, server_log)
+
+        # Deck resolution doesn't need the server, so overlap it with boot.
+        # Only this worker touches player decks until result() is called.
+        with ThreadPoolExecutor(max_workers=1) as executor:
+            players_config_future = executor.submit(
+                _write_players_config, config, project_root, game_dir / "players_config.json"
+            )
+            server_ready = wait_for_port(config.server, config.port, config.server_wait)
+        players_config_file = players_config_future.result()
 
-        if not wait_for_port(config.server, config.port, config.server_wait):
+        if not server_ready:
             print(f"ERROR: Server failed to start within {config.server_wait}s")
             print(f"Check {server_log} for details")
             return 1
 
         print("Server is ready!")
 
-        # Player config was already loaded above (passed to observer/GUI via environment variable)
+        # The resolved player config reaches the observer as players_config.json,
+        # written above while the server booted and named by
+        # XMAGE_AI_HARNESS_PLAYERS_CONFIG_FILE.  The inline
+        # XMAGE_AI_HARNESS_PLAYERS_CONFIG variable is now only the fallback
+        # AiHarnessConfig.getPlayersConfigJson() reads when no file is passed.
         if config.config_file:
             print(f"Using config: {config.config_file}")
             # Copy config into game directory for reference
             shutil.copy2(config.config_file, game_dir / "config.json")
 
-        config.resolve_random_decks(project_root)
-
         # Choose which observer client to start (streaming or regular GUI)
         if config.streaming:
             print("Starting streaming observer client...")
@@ -700,25 +889,24 @@ def main() -> int:
         else:
             start_observer_client = start_gui_client
 
-        # Count headless clients (sleepwalker, chatterbox, pilot, potato, legacy skeleton)
-        headless_count = (
-            len(config.sleepwalker_players) +
-            len(config.chatterbox_players) +
-            len(config.pilot_players) +
-            len(config.potato_players) +
-            len(config.staller_players) +
-            len(config.skeleton_players)  # Legacy
-        )
-
         # Start observer client first
         if config.streaming:
-            observer_proc = start_observer_client(pm, project_root, config, observer_log, game_dir=game_dir)
+            observer_proc = start_observer_client(
+                pm, project_root, config, observer_log,
+                game_dir=game_dir, players_config_file=players_config_file,
+            )
         else:
-            observer_proc = start_observer_client(pm, project_root, config, observer_log)
+            observer_proc = start_observer_client(
+                pm, project_root, config, observer_log, players_config_file=players_config_file,
+            )
 
-        # Bring the GUI window to the foreground on macOS
-        bring_to_foreground_macos()
+        # Bring the GUI window to the foreground on macOS.  This waits for
+        # the window to appear, so run it alongside the headless launches.
+        threading.Thread(
+            target=bring_to_foreground_macos, args=(observer_log, observer_proc), daemon=True
+        ).start()
 
+        headless_procs = {}
         if headless_count > 0:
             # Wait for observer to create the table before starting headless
             # clients.  The observer logs a distinctive line once the table is
@@ -726,35 +914,50 @@ def main() -> int:
             # delay that races against variable DB-init times.
             _wait_for_observer_table(observer_log, observer_proc, timeout=300)
 
-            # Start sleepwalker clients (MCP-based, Python controls skeleton)
+            # Collect every headless launch, then spawn them all at once.
+            # Each start_* call is dominated by Popen's fork/exec, which
+            # releases the GIL, so threads overlap the spawn latency.
+            launches = []  # (player name, start call)
+            log_lines = []
+
+            # Sleepwalker clients (MCP-based, Python controls skeleton)
             for player in config.sleepwalker_players:
                 log_path = game_dir / f"{player.name}_mcp.log"
-                print(f"Sleepwalker ({player.name}) log: {log_path}")
-                start_sleepwalker_client(pm, project_root, config, player.name, player.deck, log_path)
+                log_lines.append(f"Sleepwalker ({player.name}) log: {log_path}")
+                launches.append((player.name, partial(
+                    start_sleepwalker_client, pm, project_root, config, player.name, player.deck, log_path
+                )))
 
-            # Start chatterbox clients (LLM-based, Python controls skeleton)
+            # Chatterbox clients (LLM-based, Python controls skeleton)
             for player in config.chatterbox_players:
                 log_path = game_dir / f"{player.name}_llm.log"
-                print(f"Chatterbox ({player.name}) log: {log_path}")
-                start_chatterbox_client(pm, project_root, config, player, log_path, game_dir=game_dir)
+                log_lines.append(f"Chatterbox ({player.name}) log: {log_path}")
+                launches.append((player.name, partial(
+                    start_chatterbox_client, pm, project_root, config, player, log_path, game_dir=game_dir
+                )))
 
-            # Start pilot clients (LLM-based game player)
+            # Pilot clients (LLM-based game player)
             for player in config.pilot_players:
                 log_path = game_dir / f"{player.name}_pilot.log"
-                print(f"Pilot ({player.name}) log: {log_path}")
-                start_pilot_client(pm, project_root, config, player, log_path, game_dir=game_dir)
+                log_lines.append(f"Pilot ({player.name}) log: {log_path}")
+                launches.append((player.name, partial(
+                    start_pilot_client, pm, project_root, config, player, log_path, game_dir=game_dir
+                )))
 
-            # Start potato clients (pure Java, auto-responds)
+            # Potato clients (pure Java, auto-responds)
             for player in config.potato_players:
                 log_path = game_dir / f"{player.name}_mcp.log"
-                print(f"Potato ({player.name}) log: {log_path}")
-                start_potato_client(pm, project_root, config, player.name, player.deck, log_path)
+                log_lines.append(f"Potato ({player.name}) log: {log_path}")
+                launches.append((player.name, partial(
+                    start_potato_client, pm, project_root, config, player.name, player.deck, log_path
+                )))
 
-            # Start staller clients (pure Java, intentionally slow auto-responders)
+            # Staller clients (pure Java, intentionally slow auto-responders)
             for player in config.staller_players:
                 log_path = game_dir / f"{player.name}_mcp.log"
-                print(f"Staller ({player.name}) log: {log_path}")
-                start_potato_client(
+                log_lines.append(f"Staller ({player.name}) log: {log_path}")
+                launches.append((player.name, partial(
+                    start_potato_client,
                     pm,
                     project_root,
                     config,
@@ -762,22 +965,40 @@ def main() -> int:
                     player.deck,
                     log_path,
                     personality="staller",
-                )
+                )))
 
-            # Start legacy skeleton clients (treated as potato)
+            # Legacy skeleton clients (treated as potato)
             for player in config.skeleton_players:
                 log_path = game_dir / f"{player.name}_mcp.log"
-                print(f"Skeleton ({player.name}) log: {log_path}")
-                start_skeleton_client(pm, project_root, config, player.name, player.deck, log_path)
+                log_lines.append(f"Skeleton ({player.name}) log: {log_path}")
+                launches.append((player.name, partial(
+                    start_skeleton_client, pm, project_root, config, player.name, player.deck, log_path
+                )))
+
+            print("\n".join(log_lines))
+
+            with ThreadPoolExecutor(max_workers=len(launches)) as executor:
+                # Consuming executor.map inside dict() re-raises the first
+                # launch failure, if any
+                headless_procs = dict(zip(
+                    (name for name, _ in launches),
+                    executor.map(lambda launch: launch[1](), launches),
+                ))
 
             # Note: CPU players are handled by the GUI client/server
 
-        # Wait for observer client to exit
-        observer_proc.wait()
+        # Wait for the observer client to exit.  Also watch the server: if it
+        # dies mid-game the observer would sit on a dead connection.
+        exited = _wait_for_first_exit(
+            {"observer": observer_proc, "server": server_proc}, others=headless_procs
+        )
+        if exited == "server":
+            print(f"ERROR: XMage server exited with code {server_proc.returncode} before the game ended")
+            print(f"Check {server_log} for details")
 
         _print_game_summary(game_dir)
 
-        return 0
+        return 0 if exited == "observer" else 1
     finally:
         # Always cleanup child processes, even on exceptions
         pm.cleanup()
@@ -0,0 +1,109 @@
+"""Launch XMage modules with plain `java` instead of `mvn exec:java`.
+
+`mvn exec:java` re-reads the project model and resolves the dependency
+classpath on every launch, which adds seconds to each client start.  The
+harness resolves every module's runtime classpath once per run (right after
+compiling) into a java @argfile under the module's target/ directory, then
+starts processes with `java <jvm args> @argfile <main class>`.
+
+If resolution fails, callers fall back to `mvn exec:java`.
+"""
+
+import functools
+import os
+import shutil
+import subprocess
+from pathlib import Path
+
+# Main classes, as configured for exec-maven-plugin in each module's pom.xml
+MAIN_CLASSES = {
+    "Mage.Server": "mage.server.Main",
+    "Mage.Client": "mage.client.MageFrame",
+    "Mage.Client.Headless": "mage.client.headless.HeadlessClient",
+    "Mage.Client.Streaming": "mage.client.streaming.StreamingMain",
+}
+
+# Relative to each module directory
+DEPENDENCY_CLASSPATH_FILE = Path("target") / "harness-dependencies.classpath"
+ARGFILE = Path("target") / "harness-java.args"
+
+
+@functools.lru_cache(maxsize=None)
+def maven_executable() -> str:
+    """Maven launcher for build steps: the Maven Daemon (mvnd) when installed.
+
+    mvnd keeps a warm JVM and build graph between invocations, so repeated
+    compiles skip Maven's startup.  Launching programs still uses plain mvn,
+    since exec:java would otherwise run inside the shared daemon JVM.
+    """
+    return "mvnd" if shutil.which("mvnd") else "mvn"
+
+
+def _quote_argfile_arg(arg: str) -> str:
+    """Quote an argument for a java @argfile (backslash is its escape char)."""
+    return '"' + arg.replace("\\", "\\\\").replace('"', '\\"') + '"'
+
+
+def resolve_java_argfiles(project_root: Path, modules: list[str]) -> dict[str, Path]:
+    """Write a `-cp` argfile for each module; return {module: argfile} for those that worked.
+
+    One Maven invocation resolves every module's runtime dependencies; each
+    module's own target/classes goes first on its classpath, as with
+    exec:java.
+    """
+    for module in modules:
+        (project_root / module / DEPENDENCY_CLASSPATH_FILE).unlink(missing_ok=True)
+
+    result = subprocess.run(
+        [
+            maven_executable(),
+            "-q",
+            "-pl",
+            ",".join(modules),
+            "dependency:build-classpath",
+            "-Dmdep.includeScope=runtime",
+            f"-Dmdep.outputFile={DEPENDENCY_CLASSPATH_FILE.as_posix()}",
+        ],
+        cwd=project_root,
+    )
+    if result.returncode != 0:
+        return {}
+
+    argfiles: dict[str, Path] = {}
+    for module in modules:
+        module_dir = project_root / module
+        deps_file = module_dir / DEPENDENCY_CLASSPATH_FILE
+        if not deps_file.exists():
+            continue
+        classpath = os.pathsep.join(
+            entry for entry in (str(module_dir / "target" / "classes"), deps_file.read_text().strip()) if entry
+        )
+        argfile = module_dir / ARGFILE
+        argfile.write_text(f"-cp {_quote_argfile_arg(classpath)}\n")
+        argfiles[module] = argfile
+    return argfiles
+
+
+def java_command(module: str, argfile: Path, jvm_args: list[str]) -> list[str]:
+    """Command line running a module's main class directly on the JVM.
+
+    Uses the JVM under JAVA_HOME when set, matching what mvn runs with.
+    """
+    java_home = os.environ.get("JAVA_HOME")
+    java = os.path.join(java_home, "bin", "java") if java_home else "java"
+    return [java, *jvm_args, f"@{argfile}", MAIN_CLASSES[module]]
+
+
+def headless_command(
+    jvm_args: list[str], deck_path: Path | None, java_argfile: Path | None
+) -> tuple[str, list[str]]:
+    """(command, args) for a headless client speaking MCP over stdio.
+
+    The deck path may contain spaces, so under `mvn exec:java` it goes on
+    the Maven command line rather than in the shell-split MAVEN_OPTS.
+    """
+    system_props = [f"-Dxmage.headless.deck={deck_path}"] if deck_path else []
+    if java_argfile:
+        command = java_command("Mage.Client.Headless", java_argfile, [*jvm_args, *system_props])
+        return command[0], command[1:]
+    return "mvn", ["-q", *system_props, "exec:java"]
@@ -4,26 +4,40 @@ Fetches live model pricing from OpenRouter at startup and provides
 helpers for cost estimation and file-based cost reporting.
 """
 
+import atexit
+import functools
 import json
+import signal
+import sys
+import time
 import urllib.request
 from pathlib import Path
 
 OPENROUTER_MODELS_URL = "https://openrouter.ai/api/v1/models"
 FETCH_TIMEOUT_SECS = 10
 DEFAULT_BASE_URL = "https://openrouter.ai/api/v1"
+# The streaming client polls cost files every 2s, so writing more often
+# than that is wasted I/O unless the total moved noticeably.
+COST_WRITE_INTERVAL_SECS = 2.0
+COST_WRITE_MIN_DELTA_USD = 0.01
 
 
+# (host substring, API key env var), checked in order
+API_KEY_ENV_BY_HOST = (
+    ("openrouter.ai", "OPENROUTER_API_KEY"),
+    ("api.openai.com", "OPENAI_API_KEY"),
+    ("anthropic.com", "ANTHROPIC_API_KEY"),
+    ("googleapis.com", "GEMINI_API_KEY"),
+)
+
+
+@functools.lru_cache(maxsize=None)
 def required_api_key_env(base_url: str) -> str:
     """Infer the expected API key env var from the configured base URL."""
     host = (base_url or DEFAULT_BASE_URL).lower()
-    if "openrouter.ai" in host:
-        return "OPENROUTER_API_KEY"
-    if "api.openai.com" in host:
-        return "OPENAI_API_KEY"
-    if "anthropic.com" in host:
-        return "ANTHROPIC_API_KEY"
-    if "googleapis.com" in host or "generativelanguage.googleapis.com" in host:
-        return "GEMINI_API_KEY"
+    for host_part, key_env in API_KEY_ENV_BY_HOST:
+        if host_part in host:
+            return key_env
     return "OPENROUTER_API_KEY"
 
 
@@ -72,15 +86,17 @@ def load_prices() -> dict[str, tuple[float, float]]:
 def get_model_price(
     model: str, prices: dict[str, tuple[float, float]]
 ) -> tuple[float, float] | None:
-    """Get (input, output) price per 1M tokens, or None if unknown."""
-    if model in prices:
-        return prices[model]
-    best_match = ""
-    for candidate in prices:
-        if model.startswith(candidate) and len(candidate) > len(best_match):
-            best_match = candidate
-    if best_match:
-        return prices[best_match]
+    """Get (input, output) price per 1M tokens, or None if unknown.
+
+    Falls back to the longest price-table id that prefixes ``model``.
+    Callers look this up once per run, not per request.
+    """
+    # Probe the model's own prefixes, longest first: at most len(model)
+    # dict lookups however many models the table holds.
+    for end in range(len(model), 0, -1):
+        price = prices.get(model[:end])
+        if price is not None:
+            return price
     return None
 
 
@@ -89,7 +105,51 @@ def write_cost_file(game_dir: Path, username: str, cost: float) -> None:
     cost_file = game_dir / f"{username}_cost.json"
     tmp_file = cost_file.with_suffix(".tmp")
     try:
-        tmp_file.write_text(json.dumps({"cost_usd": cost}))
-        tmp_file.rename(cost_file)
+        tmp_file.write_bytes(json.dumps({"cost_usd": cost}).encode())
+        tmp_file.replace(cost_file)
     except Exception as e:
         print(f"[llm_cost] Failed to write cost file: {e}")
+
+
+def exit_on_sigterm() -> None:
+    """Turn SIGTERM into a normal exit so finally blocks and atexit run.
+
+    The harness stops LLM clients with SIGTERM, whose default action would
+    skip the final cost file write.
+    """
+    signal.signal(signal.SIGTERM, lambda signum, frame: sys.exit(128 + signum))
+
+
+class CostFileWriter:
+    """Coalesces per-request cost updates into occasional cost file writes.
+
+    A write happens when COST_WRITE_INTERVAL_SECS have passed since the last
+    one or the cost grew by at least COST_WRITE_MIN_DELTA_USD.  Any value
+    still pending is flushed at interpreter exit, which covers SIGTERM only
+    once exit_on_sigterm() is installed; callers should flush() themselves
+    before any long stretch without LLM calls.
+    """
+
+    def __init__(self, game_dir: Path, username: str):
+        self._game_dir = game_dir
+        self._username = username
+        self._written_cost = 0.0
+        self._pending_cost: float | None = None
+        self._last_write = float("-inf")
+        atexit.register(self.flush)
+
+    def update(self, cost: float) -> None:
+        """Record the latest cumulative cost, writing it if due."""
+        self._pending_cost = cost
+        if (time.monotonic() - self._last_write >= COST_WRITE_INTERVAL_SECS
+                or cost - self._written_cost >= COST_WRITE_MIN_DELTA_USD):
+            self.flush()
+
+    def flush(self) -> None:
+        """Write the pending cost, if any."""
+        if self._pending_cost is None:
+            return
+        write_cost_file(self._game_dir, self._username, self._pending_cost)
+        self._written_cost = self._pending_cost
+        self._pending_cost = None
+        self._last_write = time.monotonic()
@@ -0,0 +1,51 @@
+"""Pass-only mode shared by the LLM clients.
+
+Once the LLM is unusable (credits exhausted, model gone, degraded output)
+the client keeps its seat by auto-passing for the rest of the game: it
+long-polls the server, backs off exponentially while nothing is happening,
+and gives up once the MCP session itself keeps failing (skeleton client
+gone).
+"""
+
+import asyncio
+import json
+
+from mcp import ClientSession
+
+PASS_ONLY_TIMEOUT_MS = 30000
+PASS_ONLY_MAX_BACKOFF_SECS = 30
+PASS_ONLY_MAX_FAILURES = 5
+
+
+async def run_pass_only(session: ClientSession, log_prefix: str) -> None:
+    """Auto-pass for the rest of the game without the LLM."""
+    idle_polls = 0
+    failures = 0
+    while True:
+        try:
+            result = await session.call_tool(
+                "auto_pass_until_event", {"timeout_ms": PASS_ONLY_TIMEOUT_MS}
+            )
+            result_data = json.loads(result.content[0].text)
+        except json.JSONDecodeError:
+            result_data = {}
+        except Exception as e:
+            result_data = {"error": str(e)}
+        if not isinstance(result_data, dict):
+            result_data = {}
+        if "error" in result_data:
+            failures += 1
+            print(f"[{log_prefix}] Pass-only error: {result_data['error']} [{failures}]")
+            if failures >= PASS_ONLY_MAX_FAILURES:
+                print(f"[{log_prefix}] MCP session keeps failing, stopping pass-only mode")
+                return
+            await asyncio.sleep(5)
+            continue
+        failures = 0
+
+        if result_data.get("event_occurred") or result_data.get("actions_taken"):
+            idle_polls = 0
+            continue
+        idle_polls += 1
+        if idle_polls >= 2:
+            await asyncio.sleep(min(PASS_ONLY_MAX_BACKOFF_SECS, 1 << idle_polls))
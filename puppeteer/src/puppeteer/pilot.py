@@ -11,13 +11,16 @@ from mcp import ClientSession, StdioServerParameters
 from mcp.client.stdio import stdio_client
 from openai import AsyncOpenAI
 
+from puppeteer.java_launch import headless_command
 from puppeteer.llm_cost import (
     DEFAULT_BASE_URL,
+    CostFileWriter,
+    exit_on_sigterm,
     get_model_price,
     load_prices,
     required_api_key_env,
-    write_cost_file,
 )
+from puppeteer.pass_only import run_pass_only
 
 
 DEFAULT_MODEL = "google/gemini-2.0-flash-001"
@@ -124,201 +127,208 @@ async def run_pilot_loop(
     ]
     model_price = get_model_price(model, prices or {})
     cumulative_cost = 0.0
+    cost_writer = CostFileWriter(game_dir, username) if game_dir else None
     empty_responses = 0  # consecutive LLM responses with no reasoning text
     consecutive_timeouts = 0
 
-    while True:
-        # Check for auto-passable actions before calling LLM
-        try:
-            status_result = await execute_tool(session, "is_action_on_me", {})
-            status = json.loads(status_result)
-            if status.get("action_pending"):
-                auto, args = should_auto_pass(status)
-                if auto:
-                    await execute_tool(session, "choose_action", args)
-                    print(f"[pilot] Auto-passed: {status.get('action_type')}")
-                    continue
-        except Exception:
-            pass
-
-        try:
-            response = await asyncio.wait_for(
-                client.chat.completions.create(
-                    model=model,
-                    messages=messages,
-                    tools=tools,
-                    tool_choice="auto",
-                    max_tokens=MAX_TOKENS,
-                ),
-                timeout=LLM_REQUEST_TIMEOUT_SECS,
-            )
-            consecutive_timeouts = 0
-            choice = response.choices[0]
-
-            # Track token usage and cost
-            if response.usage and model_price is not None:
-                input_cost = (response.usage.prompt_tokens or 0) * model_price[0] / 1_000_000
-                output_cost = (response.usage.completion_tokens or 0) * model_price[1] / 1_000_000
-                cumulative_cost += input_cost + output_cost
-                if game_dir:
-                    write_cost_file(game_dir, username, cumulative_cost)
-
-            # If the LLM produced tool calls, process them
-            if choice.message.tool_calls:
-                # Tool calls present = LLM is functioning, reset degradation counter.
-                # Gemini often omits reasoning text for obvious actions (like passing) -
-                # that's normal, not degradation.
-                if choice.message.content:
-                    print(f"[pilot] Thinking: {choice.message.content}")
-                empty_responses = 0
-                # Build a clean assistant message dict for cross-provider
-                # compatibility.  The raw ChatCompletionMessage includes extra
-                # fields (refusal, annotations, audio, function_call) that
-                # some providers (notably xAI/Grok) reject with 422 errors.
-                assistant_msg: dict = {"role": "assistant", "content": choice.message.content}
-                if choice.message.tool_calls:
-                    assistant_msg["tool_calls"] = [
-                        {
-                            "id": tc.id,
-                            "type": "function",
-                            "function": {
-                                "name": tc.function.name,
-                                "arguments": tc.function.arguments,
-                            },
-                        }
-                        for tc in choice.message.tool_calls
-                    ]
-                messages.append(assistant_msg)
-
-                for tool_call in choice.message.tool_calls:
-                    fn = tool_call.function
-                    args = json.loads(fn.arguments) if fn.arguments else {}
-                    print(f"[pilot] Tool: {fn.name}({json.dumps(args, separators=(',', ':'))})")
-
-                    result_text = await execute_tool(session, fn.name, args)
-
-                    # Log interesting results
-                    if fn.name == "choose_action":
-                        result_data = json.loads(result_text)
-                        action_taken = result_data.get("action_taken", "")
-                        success = result_data.get("success", False)
-                        if success:
-                            print(f"[pilot] Action: {action_taken}")
-                        else:
-                            print(f"[pilot] Action failed: {result_data.get('error', '')}")
-                    elif fn.name == "get_action_choices":
-                        result_data = json.loads(result_text)
-                        action_type = result_data.get("action_type", "")
-                        msg = result_data.get("message", "")
-                        choices = result_data.get("choices", [])
-                        if choices:
-                            print(f"[pilot] Choices for {action_type}: {len(choices)} options")
-                        else:
-                            print(f"[pilot] Action: {action_type} - {msg[:100]}")
-                    elif fn.name == "wait_for_action":
-                        result_data = json.loads(result_text)
-                        if result_data.get("action_pending"):
-                            # Check for auto-pass before the LLM sees it
-                            auto, auto_args = should_auto_pass(result_data)
-                            if auto:
-                                await execute_tool(session, "choose_action", auto_args)
-                                print(f"[pilot] Auto-passed: {result_data.get('action_type')}")
-                                # Replace the tool result with an indication to keep waiting
-                                result_text = json.dumps({
-                                    "action_pending": False,
-                                    "auto_passed": result_data.get("action_type"),
-                                })
+    try:
+        while True:
+            # Check for auto-passable actions before calling LLM
+            try:
+                status_result = await execute_tool(session, "is_action_on_me", {})
+                status = json.loads(status_result)
+                if status.get("action_pending"):
+                    auto, args = should_auto_pass(status)
+                    if auto:
+                        await execute_tool(session, "choose_action", args)
+                        print(f"[pilot] Auto-passed: {status.get('action_type')}")
+                        continue
+            except Exception:
+                pass
 
-                    messages.append({
-                        "role": "tool",
-                        "tool_call_id": tool_call.id,
-                        "content": result_text,
-                    })
-            else:
-                # LLM stopped calling tools - prompt it to continue
-                content = (choice.message.content or "").strip()
-                if content:
-                    print(f"[pilot] Thinking: {content[:500]}")
-                    messages.append({"role": "assistant", "content": content})
+            try:
+                response = await asyncio.wait_for(
+                    client.chat.completions.create(
+                        model=model,
+                        messages=messages,
+                        tools=tools,
+                        tool_choice="auto",
+                        max_tokens=MAX_TOKENS,
+                    ),
+                    timeout=LLM_REQUEST_TIMEOUT_SECS,
+                )
+                consecutive_timeouts = 0
+                choice = response.choices[0]
+
+                # Track token usage and cost
+                if response.usage and model_price is not None:
+                    input_cost = (response.usage.prompt_tokens or 0) * model_price[0] / 1_000_000
+                    output_cost = (response.usage.completion_tokens or 0) * model_price[1] / 1_000_000
+                    cumulative_cost += input_cost + output_cost
+                    if cost_writer:
+                        cost_writer.update(cumulative_cost)
+
+                # If the LLM produced tool calls, process them
+                if choice.message.tool_calls:
+                    # Tool calls present = LLM is functioning, reset degradation counter.
+                    # Gemini often omits reasoning text for obvious actions (like passing) -
+                    # that's normal, not degradation.
+                    if choice.message.content:
+                        print(f"[pilot] Thinking: {choice.message.content}")
                     empty_responses = 0
+                    # Build a clean assistant message dict for cross-provider
+                    # compatibility.  The raw ChatCompletionMessage includes extra
+                    # fields (refusal, annotations, audio, function_call) that
+                    # some providers (notably xAI/Grok) reject with 422 errors.
+                    assistant_msg: dict = {"role": "assistant", "content": choice.message.content}
+                    if choice.message.tool_calls:
+                        assistant_msg["tool_calls"] = [
+                            {
+                                "id": tc.id,
+                                "type": "function",
+                                "function": {
+                                    "name": tc.function.name,
+                                    "arguments": tc.function.arguments,
+                                },
+                            }
+                            for tc in choice.message.tool_calls
+                        ]
+                    messages.append(assistant_msg)
+
+                    for tool_call in choice.message.tool_calls:
+                        fn = tool_call.function
+                        args = json.loads(fn.arguments) if fn.arguments else {}
+                        print(f"[pilot] Tool: {fn.name}({json.dumps(args, separators=(',', ':'))})")
+
+                        result_text = await execute_tool(session, fn.name, args)
+
+                        # Log interesting results
+                        if fn.name == "choose_action":
+                            result_data = json.loads(result_text)
+                            action_taken = result_data.get("action_taken", "")
+                            success = result_data.get("success", False)
+                            if success:
+                                print(f"[pilot] Action: {action_taken}")
+                            else:
+                                print(f"[pilot] Action failed: {result_data.get('error', '')}")
+                        elif fn.name == "get_action_choices":
+                            result_data = json.loads(result_text)
+                            action_type = result_data.get("action_type", "")
+                            msg = result_data.get("message", "")
+                            choices = result_data.get("choices", [])
+                            if choices:
+                                print(f"[pilot] Choices for {action_type}: {len(choices)} options")
+                            else:
+                                print(f"[pilot] Action: {action_type} - {msg[:100]}")
+                        elif fn.name == "wait_for_action":
+                            result_data = json.loads(result_text)
+                            if result_data.get("action_pending"):
+                                # Check for auto-pass before the LLM sees it
+                                auto, auto_args = should_auto_pass(result_data)
+                                if auto:
+                                    await execute_tool(session, "choose_action", auto_args)
+                                    print(f"[pilot] Auto-passed: {result_data.get('action_type')}")
+                                    # Replace the tool result with an indication to keep waiting
+                                    result_text = json.dumps({
+                                        "action_pending": False,
+                                        "auto_passed": result_data.get("action_type"),
+                                    })
+
+                        messages.append({
+                            "role": "tool",
+                            "tool_call_id": tool_call.id,
+                            "content": result_text,
+                        })
                 else:
-                    empty_responses += 1
-                    print(f"[pilot] Empty response from LLM (no tools, no text) [{empty_responses}]")
-                    if empty_responses >= 10:
-                        print("[pilot] LLM appears degraded (no tools or text), switching to auto-pass mode")
-                        try:
-                            await execute_tool(session, "send_chat_message", {"message": "My brain is fried... going on autopilot for the rest of this game. GG!"})
-                        except Exception:
-                            pass
-                        while True:
+                    # LLM stopped calling tools - prompt it to continue
+                    content = (choice.message.content or "").strip()
+                    if content:
+                        print(f"[pilot] Thinking: {content[:500]}")
+                        messages.append({"role": "assistant", "content": content})
+                        empty_responses = 0
+                    else:
+                        empty_responses += 1
+                        print(f"[pilot] Empty response from LLM (no tools, no text) [{empty_responses}]")
+                        if empty_responses >= 10:
+                            print("[pilot] LLM appears degraded (no tools or text), switching to auto-pass mode")
                             try:
-                                await execute_tool(session, "auto_pass_until_event", {})
-                            except Exception as pass_err:
-                                print(f"[pilot] Auto-pass error: {pass_err}")
-                                await asyncio.sleep(5)
-                messages.append({
-                    "role": "user",
-                    "content": "Continue playing. Call wait_for_action.",
-                })
-
-            # Trim message history to avoid unbounded growth.
-            # The game loop is tool-call-heavy (3+ messages per action), so we need
-            # a generous limit to avoid constant trimming that degrades LLM reasoning.
-            if len(messages) > 120:
-                print(f"[pilot] Trimming context: {len(messages)} -> ~82 messages")
-                messages = (
-                    [messages[0]]
-                    + [{"role": "user", "content": "Continue playing. Use pass_priority to skip ahead, then get_action_choices before choose_action. All cards listed are playable right now. Play cards with index=N, pass with answer=false."}]
-                    + messages[-80:]
-                )
+                                await execute_tool(session, "send_chat_message", {"message": "My brain is fried... going on autopilot for the rest of this game. GG!"})
+                            except Exception:
+                                pass
+                            if cost_writer:
+                                cost_writer.flush()
+                            await run_pass_only(session, "pilot")
+                            return
+                    messages.append({
+                        "role": "user",
+                        "content": "Continue playing. Call wait_for_action.",
+                    })
 
-        except asyncio.TimeoutError:
-            consecutive_timeouts += 1
-            print(f"[pilot] LLM request timed out after {LLM_REQUEST_TIMEOUT_SECS}s [{consecutive_timeouts}]")
-            try:
-                await execute_tool(session, "auto_pass_until_event", {"timeout_ms": 5000})
-            except Exception:
-                await asyncio.sleep(5)
+                # Trim message history to avoid unbounded growth.
+                # The game loop is tool-call-heavy (3+ messages per action), so we need
+                # a generous limit to avoid constant trimming that degrades LLM reasoning.
+                # The cut moves back past any tool results so none is left without
+                # the assistant message that issued its tool_call_id.
+                if len(messages) > 120:
+                    cut = len(messages) - 80
+                    while cut > 1 and messages[cut].get("role") == "tool":
+                        cut -= 1
+                    print(f"[pilot] Trimming context: {len(messages)} -> {len(messages) - cut + 2} messages")
+                    messages = (
+                        [messages[0]]
+                        + [{"role": "user", "content": "Continue playing. Use pass_priority to skip ahead, then get_action_choices before choose_action. All cards listed are playable right now. Play cards with index=N, pass with answer=false."}]
+                        + messages[cut:]
+                    )
+
+            except asyncio.TimeoutError:
+                consecutive_timeouts += 1
+                print(f"[pilot] LLM request timed out after {LLM_REQUEST_TIMEOUT_SECS}s [{consecutive_timeouts}]")
+                try:
+                    await execute_tool(session, "auto_pass_until_event", {"timeout_ms": 5000})
+                except Exception:
+                    await asyncio.sleep(5)
 
-            if consecutive_timeouts >= MAX_CONSECUTIVE_TIMEOUTS:
-                print("[pilot] Repeated LLM timeouts, resetting conversation context")
-                messages = [
-                    {"role": "system", "content": system_prompt},
-                    {"role": "user", "content": "Continue playing. Call wait_for_action."},
-                ]
-                consecutive_timeouts = 0
+                if consecutive_timeouts >= MAX_CONSECUTIVE_TIMEOUTS:
+                    print("[pilot] Repeated LLM timeouts, resetting conversation context")
+                    messages = [
+                        {"role": "system", "content": system_prompt},
+                        {"role": "user", "content": "Continue playing. Call wait_for_action."},
+                    ]
+                    consecutive_timeouts = 0
 
-        except Exception as e:
-            consecutive_timeouts = 0
-            error_str = str(e)
-            print(f"[pilot] LLM error: {e}")
+            except Exception as e:
+                consecutive_timeouts = 0
+                error_str = str(e)
+                print(f"[pilot] LLM error: {e}")
 
-            # Permanent failures - fall back to auto-pass mode forever
-            if "402" in error_str or "404" in error_str:
-                reason = "Credits exhausted" if "402" in error_str else "Model not found"
-                print(f"[pilot] {reason}, switching to auto-pass mode")
+                # Permanent failures - fall back to auto-pass mode forever
+                if "402" in error_str or "404" in error_str:
+                    reason = "Credits exhausted" if "402" in error_str else "Model not found"
+                    print(f"[pilot] {reason}, switching to auto-pass mode")
+                    try:
+                        await execute_tool(session, "send_chat_message", {"message": f"{reason}... going on autopilot. GG!"})
+                    except Exception:
+                        pass
+                    if cost_writer:
+                        cost_writer.flush()
+                    await run_pass_only(session, "pilot")
+                    return
+
+                # Transient error - keep actions flowing while waiting to retry
                 try:
-                    await execute_tool(session, "send_chat_message", {"message": f"{reason}... going on autopilot. GG!"})
+                    await execute_tool(session, "auto_pass_until_event", {"timeout_ms": 5000})
                 except Exception:
-                    pass
-                while True:
-                    try:
-                        await execute_tool(session, "auto_pass_until_event", {})
-                    except Exception as pass_err:
-                        print(f"[pilot] Pass-only error: {pass_err}")
-                        await asyncio.sleep(5)
-
-            # Transient error - keep actions flowing while waiting to retry
-            try:
-                await execute_tool(session, "auto_pass_until_event", {"timeout_ms": 5000})
-            except Exception:
-                await asyncio.sleep(5)
+                    await asyncio.sleep(5)
 
-            # Reset conversation on error
-            messages = [
-                {"role": "system", "content": system_prompt},
-                {"role": "user", "content": "Continue playing. Call wait_for_action."},
-            ]
+                # Reset conversation on error
+                messages = [
+                    {"role": "system", "content": system_prompt},
+                    {"role": "user", "content": "Continue playing. Call wait_for_action."},
+                ]
+    finally:
+        # Don't leave the last few requests' cost unreported
+        if cost_writer:
+            cost_writer.flush()
 
 
 async def run_pilot(
@@ -327,6 +337,7 @@ async def run_pilot(
     username: str,
     project_root: Path,
     deck_path: Path | None = None,
+    java_argfile: Path | None = None,
     api_key: str = "",
     model: str = DEFAULT_MODEL,
     base_url: str = DEFAULT_BASE_URL,
@@ -359,20 +370,14 @@ async def run_pilot(
         jvm_args_list.append("-Dapple.awt.UIElement=true")
     jvm_args = " ".join(jvm_args_list)
 
-    env = os.environ.copy()
-    env["MAVEN_OPTS"] = jvm_args
+    env = {**os.environ, "MAVEN_OPTS": jvm_args}
 
-    # Pass deck path as a Maven CLI arg (not in MAVEN_OPTS) because
-    # MAVEN_OPTS gets shell-split by the mvn script, breaking paths with spaces.
-    # Maven CLI -D args go through "$@" which preserves spaces correctly.
-    mvn_args = ["-q"]
-    if deck_path:
-        mvn_args.append(f"-Dxmage.headless.deck={deck_path}")
-    mvn_args.append("exec:java")
+    # Plain java when the harness resolved the classpath, else mvn exec:java
+    command, command_args = headless_command(jvm_args_list, deck_path, java_argfile)
 
     server_params = StdioServerParameters(
-        command="mvn",
-        args=mvn_args,
+        command=command,
+        args=command_args,
         cwd=str(project_root / "Mage.Client.Headless"),
         env=env,
     )
@@ -401,6 +406,7 @@ def main() -> int:
     parser.add_argument("--username", default="Pilot", help="Player username")
     parser.add_argument("--project-root", type=Path, help="Project root directory")
     parser.add_argument("--deck", type=Path, help="Path to deck file (.dck)")
+    parser.add_argument("--java-argfile", type=Path, help="java @argfile with the headless client classpath (default: mvn exec:java)")
     parser.add_argument("--api-key", default="", help="API key (prefer OPENROUTER_API_KEY env var)")
     parser.add_argument("--model", default=DEFAULT_MODEL, help=f"LLM model (default: {DEFAULT_MODEL})")
     parser.add_argument("--base-url", default=DEFAULT_BASE_URL, help=f"API base URL (default: {DEFAULT_BASE_URL})")
@@ -429,6 +435,7 @@ def main() -> int:
     prices = load_prices()
     print(f"[pilot] Project root: {project_root}")
 
+    exit_on_sigterm()
     try:
         asyncio.run(run_pilot(
             server=args.server,
@@ -436,6 +443,7 @@ def main() -> int:
             username=args.username,
             project_root=project_root,
             deck_path=args.deck,
+            java_argfile=args.java_argfile,
             api_key=api_key,
             model=args.model,
             base_url=args.base_url,
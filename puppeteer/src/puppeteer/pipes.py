@@ -0,0 +1,73 @@
+"""Pipe buffer sizing for MCP stdio transports.
+
+The headless client speaks JSON-RPC over the stdin/stdout pipes of the
+`mvn exec:java` child spawned by ``mcp.client.stdio``.  Linux defaults those
+pipes to 64KB, so a large ``get_game_state`` response stalls the JVM writer
+until the reader drains it.  On Linux we raise both pipes to 1MB with
+``F_SETPIPE_SZ`` right after the child is spawned.
+
+macOS pipes grow on demand and have no equivalent fcntl.  On Windows the
+buffer size is fixed when ``CreateNamedPipe`` is called inside the MCP
+library (``nOutBufferSize``), so there is nothing to adjust after spawn.
+"""
+
+import sys
+
+PIPE_SIZE = 1 << 20
+F_SETPIPE_SZ = 1031  # fcntl.F_SETPIPE_SZ, only exposed by Python >= 3.10 on Linux
+# Function in mcp.client.stdio that spawns the server process
+SPAWN_HOOK = "_create_platform_compatible_process"
+
+_installed = False
+
+
+def set_pipe_size(fd: int, size: int = PIPE_SIZE) -> bool:
+    """Resize a pipe's kernel buffer. Returns False if the kernel refused."""
+    if not sys.platform.startswith("linux"):
+        return False
+    import fcntl
+
+    try:
+        fcntl.fcntl(fd, getattr(fcntl, "F_SETPIPE_SZ", F_SETPIPE_SZ), size)
+        return True
+    except OSError:
+        # EPERM when size exceeds /proc/sys/fs/pipe-max-size for unprivileged users
+        return False
+
+
+def _process_pipe_fds(process) -> list[int]:
+    """Return the parent-side stdin/stdout pipe fds of an anyio asyncio process."""
+    fds = []
+    transport = getattr(getattr(process, "_process", None), "_transport", None)
+    if transport is None:
+        return fds
+    for child_fd in (0, 1):
+        pipe_transport = transport.get_pipe_transport(child_fd)
+        pipe = pipe_transport.get_extra_info("pipe") if pipe_transport else None
+        if pipe is not None:
+            fds.append(pipe.fileno())
+    return fds
+
+
+def install_large_pipes() -> None:
+    """Make ``mcp.client.stdio`` spawn its server with enlarged stdio pipes."""
+    global _installed
+    if _installed or not sys.platform.startswith("linux"):
+        return
+    import mcp.client.stdio as mcp_stdio
+
+    # Private mcp hook; if a release renames it, run on default-sized pipes
+    spawn = getattr(mcp_stdio, SPAWN_HOOK, None)
+    if spawn is None:
+        print(f"[pipes] mcp.client.stdio has no {SPAWN_HOOK}; keeping default pipe sizes")
+        _installed = True
+        return
+
+    async def spawn_with_large_pipes(*args, **kwargs):
+        process = await spawn(*args, **kwargs)
+        for fd in _process_pipe_fds(process):
+            set_pipe_size(fd)
+        return process
+
+    setattr(mcp_stdio, SPAWN_HOOK, spawn_with_large_pipes)
+    _installed = True
@@ -32,20 +32,47 @@ def find_available_port(host: str, start_port: int, max_attempts: int = 100) ->
     """Find an available port starting from start_port.
     Uses bind() to check availability, which catches TIME_WAIT and other
     states that connect-based checks miss. Also checks secondary port (port+8)."""
-    for offset in range(max_attempts):
-        port = start_port + offset
-        if can_bind_port(port) and can_bind_port(port + 8):
-            return port
+    # A failed bind leaves the socket unbound, so one probe socket walks the
+    # range; it is only replaced after a bind succeeds on an unusable port.
+    probe = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+    try:
+        for offset in range(max_attempts):
+            port = start_port + offset
+            try:
+                probe.bind(("", port))
+            except OSError:
+                continue
+            if can_bind_port(port + 8):
+                return port
+            probe.close()
+            probe = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+    finally:
+        probe.close()
     raise RuntimeError(
         f"No available port found in range {start_port}-{start_port + max_attempts}"
     )
 
 
-def wait_for_port(host: str, port: int, timeout: int, poll_interval: float = 1.0) -> bool:
-    """Wait for a port to become reachable (server started)."""
-    start = time.time()
-    while time.time() - start < timeout:
+def wait_for_port(
+    host: str,
+    port: int,
+    timeout: int,
+    poll_interval: float = 0.4,
+    initial_poll_interval: float = 0.05,
+) -> bool:
+    """Wait for a port to become reachable (server started).
+
+    Checks immediately, then backs off from initial_poll_interval, doubling
+    up to poll_interval, so a ready server is noticed within a fraction of a
+    second without spinning through a slow boot.
+    """
+    deadline = time.monotonic() + timeout
+    interval = initial_poll_interval
+    while True:
         if is_port_in_use(host, port):
             return True
-        time.sleep(poll_interval)
-    return False
+        remaining = deadline - time.monotonic()
+        if remaining <= 0:
+            return False
+        time.sleep(min(interval, remaining))
+        interval = min(interval * 2, poll_interval)
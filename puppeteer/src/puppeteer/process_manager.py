@@ -150,23 +150,35 @@ class ProcessManager:
         if env:
             merged_env.update(env)
 
-        stdout = open(log_file, "w") if log_file else subprocess.PIPE
-        stderr = subprocess.STDOUT if log_file else subprocess.PIPE
-
-        proc = subprocess.Popen(
-            args,
-            cwd=cwd,
-            env=merged_env,
-            stdout=stdout,
-            stderr=stderr,
-            # Don't use start_new_session=True - keep processes in same group
-            # so they receive signals when parent is killed
-        )
-
+        log = open(log_file, "w") if log_file else None
+        try:
+            proc = subprocess.Popen(
+                args,
+                cwd=cwd,
+                env=merged_env,
+                stdout=log or subprocess.PIPE,
+                stderr=subprocess.STDOUT if log else subprocess.PIPE,
+                # Don't use start_new_session=True - keep processes in same group
+                # so they receive signals when parent is killed
+            )
+        finally:
+            # The child holds its own copy of the log descriptor
+            if log:
+                log.close()
+
+        return self.track(proc)
+
+    def track(self, proc: subprocess.Popen) -> subprocess.Popen:
+        """Track an already started process for cleanup and return it.
+
+        A process started after cleanup() has run is killed at once.
+        """
         with self._lock:
-            self._processes.append(proc)
-            self._write_pid_file()
-
+            if not self._cleaned_up:
+                self._processes.append(proc)
+                self._write_pid_file()
+                return proc
+        self._kill_tree(proc.pid)
         return proc
 
     def _kill_tree(self, pid: int):
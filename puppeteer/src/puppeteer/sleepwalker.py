@@ -12,6 +12,8 @@ from pathlib import Path
 from mcp import ClientSession, StdioServerParameters
 from mcp.client.stdio import stdio_client
 
+from puppeteer.java_launch import headless_command
+
 SLEEPY_NOISES = [
     "zzz",
     "zzzz",
@@ -42,6 +44,7 @@ async def run_sleepwalker(
     username: str,
     project_root: Path,
     deck_path: Path | None = None,
+    java_argfile: Path | None = None,
 ) -> None:
     """Run the sleepwalker client."""
     print(f"[sleepwalker] Starting for {username}@{server}:{port}")
@@ -59,19 +62,14 @@ async def run_sleepwalker(
     jvm_args = " ".join(jvm_args_list)
 
     # Set up environment
-    env = os.environ.copy()
-    env["MAVEN_OPTS"] = jvm_args
+    env = {**os.environ, "MAVEN_OPTS": jvm_args}
 
-    # Pass deck path as a Maven CLI arg (not in MAVEN_OPTS) because
-    # MAVEN_OPTS gets shell-split by the mvn script, breaking paths with spaces.
-    mvn_args = ["-q"]
-    if deck_path:
-        mvn_args.append(f"-Dxmage.headless.deck={deck_path}")
-    mvn_args.append("exec:java")
+    # Plain java when the harness resolved the classpath, else mvn exec:java
+    command, command_args = headless_command(jvm_args_list, deck_path, java_argfile)
 
     server_params = StdioServerParameters(
-        command="mvn",
-        args=mvn_args,
+        command=command,
+        args=command_args,
         cwd=str(project_root / "Mage.Client.Headless"),
         env=env,
     )
@@ -162,6 +160,7 @@ def main() -> int:
     parser.add_argument("--username", default="Sleepy", help="Player username")
     parser.add_argument("--project-root", type=Path, help="Project root directory")
     parser.add_argument("--deck", type=Path, help="Path to deck file (.dck)")
+    parser.add_argument("--java-argfile", type=Path, help="java @argfile with the headless client classpath (default: mvn exec:java)")
     args = parser.parse_args()
 
     # Determine project root
@@ -185,6 +184,7 @@ def main() -> int:
             username=args.username,
             project_root=project_root,
             deck_path=args.deck,
+            java_argfile=args.java_argfile,
         ))
     except KeyboardInterrupt:
         pass
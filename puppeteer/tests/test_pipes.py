@@ -0,0 +1,13 @@
+"""install_large_pipes() patches a private mcp hook; fail loudly if it moves."""
+
+import inspect
+
+import mcp.client.stdio as mcp_stdio
+
+from puppeteer.pipes import SPAWN_HOOK
+
+
+def test_mcp_stdio_spawn_hook_exists():
+    spawn = getattr(mcp_stdio, SPAWN_HOOK, None)
+    assert spawn is not None, f"mcp.client.stdio no longer defines {SPAWN_HOOK}"
+    assert inspect.iscoroutinefunction(spawn)